@@ -1,5 +1,33 @@
 """Configuration for the Lending Agent."""
-from typing import List, Dict, Any
+import sys
+from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping
+
+
+@lru_cache(maxsize=512)
+def _lower_key(value: str) -> str:
+    """Memoised, interned ``value.strip().lower()``; spellings repeat heavily."""
+    return sys.intern(value.strip().lower())
+
+
+@lru_cache(maxsize=512)
+def _upper_key(value: str) -> str:
+    """Memoised, interned ``value.strip().upper()``; spellings repeat heavily."""
+    return sys.intern(value.strip().upper())
+
+
+def _parse_policy(policy: Dict[str, Any]) -> Mapping[str, Any]:
+    """Freeze a raw policy with its amount bounds parsed to Decimal once."""
+    return MappingProxyType(
+        {
+            "min_amount": Decimal(policy["min_amount"]),
+            "max_amount": Decimal(policy["max_amount"]),
+            "decimals": int(policy.get("decimals", 18)),
+        }
+    )
+
 
 class LendingConfig:
     """Static configuration for supported lending assets and networks."""
@@ -72,6 +100,34 @@ class LendingConfig:
 
     SUPPORTED_ACTIONS = ["supply", "borrow", "repay", "withdraw"]
 
+    # Case-insensitive lookup tables built once at class load: normalised input
+    # maps straight to the canonical spelling, so validation is a single dict
+    # hit. Canonical spellings are their own keys, so already-normalised input
+    # (the common case for tool calls) resolves before any string is rebuilt,
+    # and other spellings go through the memoised _lower_key/_upper_key.
+    # The lists above remain the ordered, user-facing form returned to the
+    # agent and quoted in error messages.
+    _NETWORK_INDEX = {net.lower(): net for net in SUPPORTED_NETWORKS}
+    _ASSET_INDEX = {
+        net: {sym.upper(): sym for sym in assets}
+        for net, assets in SUPPORTED_ASSETS.items()
+    }
+    _ACTION_INDEX = {act.lower(): act for act in SUPPORTED_ACTIONS}
+
+    # Parsed, read-only policies keyed by (network, symbol) so lookups need no
+    # copy and validators compare against ready-made Decimal bounds.
+    _FLAT_POLICIES = {
+        (net, sym): _parse_policy(policy)
+        for net, policies in ASSET_POLICIES.items()
+        for sym, policy in policies.items()
+    }
+    _DEFAULT_POLICY_VIEW = _parse_policy(DEFAULT_ASSET_POLICY)
+
+    # Pre-rendered "Supported: [...]" lists for validation error messages.
+    _NETWORKS_TEXT = str(SUPPORTED_NETWORKS)
+    _ASSETS_TEXT = {net: str(assets) for net, assets in SUPPORTED_ASSETS.items()}
+    _ACTIONS_TEXT = str(SUPPORTED_ACTIONS)
+
     @classmethod
     def list_networks(cls) -> List[str]:
         return cls.SUPPORTED_NETWORKS
@@ -82,31 +138,32 @@ class LendingConfig:
 
     @classmethod
     def validate_network(cls, network: str) -> str:
-        net = network.lower().strip()
-        if net not in cls.SUPPORTED_NETWORKS:
-            raise ValueError(f"Network '{network}' is not supported. Supported: {cls.SUPPORTED_NETWORKS}")
+        net = cls._NETWORK_INDEX.get(network) or cls._NETWORK_INDEX.get(_lower_key(network))
+        if net is None:
+            raise ValueError(f"Network '{network}' is not supported. Supported: {cls._NETWORKS_TEXT}")
         return net
 
     @classmethod
     def validate_asset(cls, asset: str, network: str) -> str:
         net = cls.validate_network(network)
-        symbol = asset.upper().strip()
-        supported = cls.list_assets(net)
-        if symbol not in supported:
+        assets = cls._ASSET_INDEX.get(net, {})
+        symbol = assets.get(asset) or assets.get(_upper_key(asset))
+        if symbol is None:
+            supported = cls._ASSETS_TEXT.get(net, "[]")
             raise ValueError(f"Asset '{asset}' is not supported on {net}. Supported: {supported}")
         return symbol
 
     @classmethod
     def validate_action(cls, action: str) -> str:
-        act = action.lower().strip()
-        if act not in cls.SUPPORTED_ACTIONS:
-            raise ValueError(f"Action '{action}' is not supported. Supported: {cls.SUPPORTED_ACTIONS}")
+        act = cls._ACTION_INDEX.get(action) or cls._ACTION_INDEX.get(_lower_key(action))
+        if act is None:
+            raise ValueError(f"Action '{action}' is not supported. Supported: {cls._ACTIONS_TEXT}")
         return act
 
     @classmethod
-    def get_asset_policy(cls, network: str, asset: str) -> Dict[str, Any]:
-        """Return the amount policy (min, max, decimals) for a network/asset pair."""
-        net = network.lower().strip()
-        sym = asset.upper().strip()
-        net_policies = cls.ASSET_POLICIES.get(net, {})
-        return dict(net_policies.get(sym, cls.DEFAULT_ASSET_POLICY))
+    def get_asset_policy(cls, network: str, asset: str) -> Mapping[str, Any]:
+        """Return the parsed amount policy (Decimal min/max, int decimals) for a network/asset pair."""
+        net = cls._NETWORK_INDEX.get(network) or cls._NETWORK_INDEX.get(_lower_key(network))
+        assets = cls._ASSET_INDEX.get(net, {})
+        sym = assets.get(asset) or assets.get(_upper_key(asset))
+        return cls._FLAT_POLICIES.get((net, sym), cls._DEFAULT_POLICY_VIEW)
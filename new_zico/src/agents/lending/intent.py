@@ -3,12 +3,16 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from src.agents.lending.config import LendingConfig
 
+@lru_cache(maxsize=1024)
 def _format_decimal(value: Decimal) -> str:
+    if value.is_finite() and value == value.to_integral_value():
+        return str(int(value))
     normalized = value.normalize()
     exponent = normalized.as_tuple().exponent
     if exponent > 0:
@@ -35,6 +39,10 @@ class LendingIntent:
     asset: Optional[str] = None
     amount: Optional[Decimal] = None
     updated_at: float = field(default_factory=lambda: time.time())
+    # Memo of the last formatted amount; to_dict/to_summary run every tool turn.
+    _amount_cache: Optional[tuple[Decimal, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def touch(self) -> None:
         self.updated_at = time.time()
@@ -62,9 +70,15 @@ class LendingIntent:
         return fields
 
     def amount_as_str(self) -> Optional[str]:
-        if self.amount is None:
+        amount = self.amount
+        if amount is None:
             return None
-        return _format_decimal(self.amount)
+        cached = self._amount_cache
+        if cached is not None and cached[0] is amount:
+            return cached[1]
+        text = _format_decimal(amount)
+        self._amount_cache = (amount, text)
+        return text
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -78,9 +92,7 @@ class LendingIntent:
         }
 
     def to_public(self) -> Dict[str, Optional[str]]:
-        public = self.to_dict()
-        public["amount"] = self.amount_as_str()
-        return public
+        return self.to_dict()
 
     def to_summary(self, status: str, error: Optional[str] = None) -> Dict[str, Any]:
         summary: Dict[str, Any] = {
@@ -107,3 +119,43 @@ class LendingIntent:
         )
         intent.updated_at = float(data.get("updated_at", time.time()))
         return intent
+
+
+@dataclass(slots=True)
+class LendingMeta:
+    """Per-turn lending metadata; turned into a dict only when stored."""
+
+    event: str
+    status: str
+    action: Optional[str]
+    network: Optional[str]
+    asset: Optional[str]
+    amount: Optional[str]
+    user_id: str
+    conversation_id: str
+    missing_fields: List[str]
+    next_field: Optional[str]
+    pending_question: Optional[str]
+    choices: Sequence[str]
+    error: Optional[str]
+    history: Optional[List[Dict[str, Any]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "event": self.event,
+            "status": self.status,
+            "action": self.action,
+            "network": self.network,
+            "asset": self.asset,
+            "amount": self.amount,
+            "user_id": self.user_id,
+            "conversation_id": self.conversation_id,
+            "missing_fields": self.missing_fields,
+            "next_field": self.next_field,
+            "pending_question": self.pending_question,
+            "choices": self.choices,
+            "error": self.error,
+        }
+        if self.history:
+            data["history"] = self.history
+        return data
@@ -1,17 +1,21 @@
 """Gateway-backed storage for lending intents with local fallback."""
 from __future__ import annotations
 
-import copy
 import time
 import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import wraps
+from itertools import islice
 from threading import Lock
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 from src.integrations.panorama_gateway import (
     PanoramaGatewayClient,
     PanoramaGatewayError,
     PanoramaGatewaySettings,
+    get_panorama_client,
     get_panorama_settings,
 )
 
@@ -20,13 +24,67 @@ LENDING_HISTORY_ENTITY = "lending-histories"
 
 
 def _utc_now_iso() -> str:
-    return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat()
 
 
 def _identifier(user_id: str, conversation_id: str) -> str:
     return f"{user_id}:{conversation_id}"
 
 
+# (public key, gateway key) pairs for lending history entries.
+_HISTORY_FIELDS = (
+    ("status", "status"),
+    ("action", "action"),
+    ("network", "network"),
+    ("asset", "asset"),
+    ("amount", "amount"),
+    ("error", "errorMessage"),
+    ("timestamp", "recordedAt"),
+)
+
+_RAISE = object()
+
+
+def _gateway_call(on_404: Any, on_error: Any = _RAISE):
+    """Map gateway errors for a repository method in one place.
+
+    A 404 returns ``on_404`` (shared, so it must be immutable). Any other error switches the repository to the
+    local store and then re-raises, or returns ``on_error`` when one is given.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return fn(self, *args, **kwargs)
+            except PanoramaGatewayError as exc:
+                if exc.status_code == 404:
+                    return on_404
+                self._handle_gateway_failure(exc)
+                if on_error is _RAISE:
+                    raise
+                return on_error
+
+        return wrapper
+
+    return decorator
+
+
+def _copy_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a metadata record without deepcopy.
+
+    Values are scalars or lists of scalars/flat dicts (``missing_fields``,
+    ``choices``, ``history``), so copying one level below the top is enough to
+    isolate the stored record from the caller.
+    """
+    return {
+        key: [dict(item) if isinstance(item, dict) else item for item in value]
+        if isinstance(value, list)
+        else value
+        for key, value in record.items()
+    }
+
+
 def _as_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -36,6 +94,15 @@ def _as_float(value: Any) -> Optional[float]:
         return None
 
 
+@dataclass(slots=True)
+class _LocalSession:
+    """In-memory fallback state for one user/conversation pair."""
+
+    intent: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None
+    history: Deque[Dict[str, Any]] = field(default_factory=deque)
+
+
 class LendingStateRepository:
     """Stores lending agent state via Panorama's gateway or an in-memory fallback."""
 
@@ -48,26 +115,44 @@ class LendingStateRepository:
         client: PanoramaGatewayClient | None = None,
         settings: PanoramaGatewaySettings | None = None,
         history_limit: int = 10,
+        session_cache_ttl: float = 2.0,
+        session_cache_size: int = 1024,
     ) -> None:
         self._logger = logging.getLogger(__name__)
         self._history_limit = history_limit
+        # Short-lived read-through LRU of gateway sessions keyed by identifier.
+        # Entries are (monotonic timestamp, session or None) and are refreshed by
+        # our own writes, so one agent turn costs at most one session GET.
+        self._session_cache: OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]] = OrderedDict()
+        self._session_cache_ttl = session_cache_ttl
+        self._session_cache_size = session_cache_size
+        self._session_cache_lock = Lock()
         try:
             self._settings = settings or get_panorama_settings()
-            self._client = client or PanoramaGatewayClient(self._settings)
+            self._client = client or (
+                PanoramaGatewayClient(self._settings) if settings else get_panorama_client()
+            )
             self._use_gateway = True
         except ValueError:
             # PANORAMA_GATEWAY_URL or JWT secrets not configured – fall back to local store.
             self._settings = None
             self._client = None
             self._use_gateway = False
+        self._tenant = self._settings.tenant_id if self._settings else "tenant-agent"
         self._init_local_store()
 
     def _init_local_store(self) -> None:
-        if not hasattr(self, "_state"):
-            self._state = {"intents": {}, "metadata": {}, "history": {}}
+        if not hasattr(self, "_sessions"):
+            self._sessions: Dict[str, _LocalSession] = {}
+
+    def _local_session(self, key: str) -> _LocalSession:
+        record = self._sessions.get(key)
+        if record is None:
+            record = self._sessions[key] = _LocalSession(history=deque(maxlen=self._history_limit))
+        return record
 
     def _tenant_id(self) -> str:
-        return self._settings.tenant_id if self._settings else "tenant-agent"
+        return self._tenant
 
     def _fallback_to_local_store(self) -> None:
         if self._use_gateway:
@@ -76,21 +161,24 @@ class LendingStateRepository:
         self._init_local_store()
 
     def _handle_gateway_failure(self, exc: PanoramaGatewayError) -> None:
-        self._logger.warning(
-            "Panorama gateway error (%s) for lending repository: %s",
-            getattr(exc, "status_code", "unknown"),
-            getattr(exc, "payload", exc),
-        )
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(
+                "Panorama gateway error (%s) for lending repository: %s",
+                getattr(exc, "status_code", "unknown"),
+                getattr(exc, "payload", exc),
+            )
         self._fallback_to_local_store()
 
     # ---- Singleton helpers -----------------------------------------------
     @classmethod
     def instance(cls) -> "LendingStateRepository":
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = cls()
-        return cls._instance
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
 
     @classmethod
     def reset(cls) -> None:
@@ -98,20 +186,15 @@ class LendingStateRepository:
             cls._instance = None
 
     # ---- Core API ---------------------------------------------------------
+    # Each public method tries the gateway path first and, if that path switched
+    # the repository to the local store, finishes on the local path directly
+    # instead of re-entering itself.
     def load_intent(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
-        if not self._use_gateway:
-            self._init_local_store()
-            record = self._state["intents"].get(_identifier(user_id, conversation_id))
-            if not record:
-                return None
-            return copy.deepcopy(record.get("intent"))
-
-        session = self._get_session(user_id, conversation_id)
-        if not self._use_gateway:
-            return self.load_intent(user_id, conversation_id)
-        if not session:
-            return None
-        return session.get("intent") or None
+        if self._use_gateway:
+            session = self._get_session(user_id, conversation_id)
+            if self._use_gateway:
+                return (session.get("intent") or None) if session else None
+        return self._load_intent_local(user_id, conversation_id)
 
     def persist_intent(
         self,
@@ -122,38 +205,14 @@ class LendingStateRepository:
         done: bool,
         summary: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        if not self._use_gateway:
-            self._init_local_store()
-            key = _identifier(user_id, conversation_id)
-            now = time.time()
-            if done:
-                self._state["intents"].pop(key, None)
-            else:
-                self._state["intents"][key] = {"intent": copy.deepcopy(intent), "updated_at": now}
-            if metadata:
-                meta_copy = copy.deepcopy(metadata)
-                meta_copy["updated_at"] = now
-                self._state["metadata"][key] = meta_copy
-            if done and summary:
-                history = self._state["history"].setdefault(key, [])
-                summary_copy = copy.deepcopy(summary)
-                summary_copy.setdefault("timestamp", now)
-                history.append(summary_copy)
-                self._state["history"][key] = history[-self._history_limit :]
-            return self.get_history(user_id, conversation_id)
-
-        try:
-            if done:
-                if summary:
-                    self._create_history_entry(user_id, conversation_id, summary)
-                self._delete_session(user_id, conversation_id)
-            else:
-                payload = self._session_payload(intent, metadata)
-                self._upsert_session(user_id, conversation_id, payload)
-            return self.get_history(user_id, conversation_id)
-        except PanoramaGatewayError as exc:
-            self._handle_gateway_failure(exc)
-            return self.persist_intent(user_id, conversation_id, intent, metadata, done, summary)
+        if self._use_gateway:
+            try:
+                return self._persist_intent_gateway(
+                    user_id, conversation_id, intent, metadata, done, summary
+                )
+            except PanoramaGatewayError as exc:
+                self._handle_gateway_failure(exc)
+        return self._persist_intent_local(user_id, conversation_id, intent, metadata, done, summary)
 
     def set_metadata(
         self,
@@ -161,82 +220,179 @@ class LendingStateRepository:
         conversation_id: str,
         metadata: Dict[str, Any],
     ) -> None:
-        if not self._use_gateway:
-            self._init_local_store()
-            key = _identifier(user_id, conversation_id)
-            if metadata:
-                meta_copy = copy.deepcopy(metadata)
-                meta_copy["updated_at"] = time.time()
-                self._state["metadata"][key] = meta_copy
-            else:
-                self._state["metadata"].pop(key, None)
-            return
-
-        try:
-            if not metadata:
-                self._delete_session(user_id, conversation_id)
+        if self._use_gateway:
+            try:
+                self._set_metadata_gateway(user_id, conversation_id, metadata)
                 return
-
-            session = self._get_session(user_id, conversation_id)
-            if not self._use_gateway:
-                return self.set_metadata(user_id, conversation_id, metadata)
-            intent = session.get("intent") if session else {}
-            payload = self._session_payload(intent or {}, metadata)
-            self._upsert_session(user_id, conversation_id, payload)
-        except PanoramaGatewayError as exc:
-            self._handle_gateway_failure(exc)
-            self.set_metadata(user_id, conversation_id, metadata)
+            except PanoramaGatewayError as exc:
+                self._handle_gateway_failure(exc)
+        self._set_metadata_local(user_id, conversation_id, metadata)
 
     def clear_metadata(self, user_id: str, conversation_id: str) -> None:
         self.set_metadata(user_id, conversation_id, {})
 
     def clear_intent(self, user_id: str, conversation_id: str) -> None:
-        if not self._use_gateway:
-            self._init_local_store()
-            self._state["intents"].pop(_identifier(user_id, conversation_id), None)
-            self._state["metadata"].pop(_identifier(user_id, conversation_id), None)
-            return
-        try:
-            self._delete_session(user_id, conversation_id)
-        except PanoramaGatewayError as exc:
-            self._handle_gateway_failure(exc)
-            self.clear_intent(user_id, conversation_id)
+        if self._use_gateway:
+            try:
+                self._delete_session(user_id, conversation_id)
+                return
+            except PanoramaGatewayError as exc:
+                self._handle_gateway_failure(exc)
+        self._clear_intent_local(user_id, conversation_id)
 
     def get_metadata(self, user_id: str, conversation_id: str) -> Dict[str, Any]:
-        if not self._use_gateway:
-            self._init_local_store()
-            record = self._state["metadata"].get(_identifier(user_id, conversation_id))
-            if not record:
-                return {}
-            entry = copy.deepcopy(record)
-            ts = entry.pop("updated_at", None)
+        identifier = _identifier(user_id, conversation_id)
+        if self._use_gateway:
+            metadata = self._get_metadata_gateway(user_id, conversation_id, identifier)
+            if self._use_gateway:
+                return metadata
+        return self._get_metadata_local(identifier)
+
+    def get_history(
+        self,
+        user_id: str,
+        conversation_id: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        if self._use_gateway:
+            try:
+                history = self._list_history(user_id, conversation_id, limit or self._history_limit)
+            except ValueError:
+                self._logger.warning("Invalid lending history response from gateway; falling back to local store.")
+                self._fallback_to_local_store()
+                history = None
+            if history is not None:
+                return history or []
+        return self._get_history_local(user_id, conversation_id, limit)
+
+    # ---- Local-store paths --------------------------------------------------
+    def _load_intent_local(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
+        record = self._sessions.get(_identifier(user_id, conversation_id))
+        if record is None or record.intent is None:
+            return None
+        return dict(record.intent)
+
+    def _persist_intent_local(
+        self,
+        user_id: str,
+        conversation_id: str,
+        intent: Dict[str, Any],
+        metadata: Dict[str, Any],
+        done: bool,
+        summary: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        record = self._local_session(_identifier(user_id, conversation_id))
+        now = time.time()
+        record.intent = None if done else dict(intent)
+        if metadata:
+            meta_copy = _copy_record(metadata)
+            meta_copy["updated_at"] = now
+            record.metadata = meta_copy
+        if done and summary:
+            summary_copy = dict(summary)
+            summary_copy.setdefault("timestamp", now)
+            record.history.append(summary_copy)
+        return self._get_history_local(user_id, conversation_id, None)
+
+    def _set_metadata_local(self, user_id: str, conversation_id: str, metadata: Dict[str, Any]) -> None:
+        key = _identifier(user_id, conversation_id)
+        if metadata:
+            meta_copy = _copy_record(metadata)
+            meta_copy["updated_at"] = time.time()
+            self._local_session(key).metadata = meta_copy
+            return
+        record = self._sessions.get(key)
+        if record is not None:
+            record.metadata = None
+
+    def _clear_intent_local(self, user_id: str, conversation_id: str) -> None:
+        record = self._sessions.get(_identifier(user_id, conversation_id))
+        if record is not None:
+            record.intent = None
+            record.metadata = None
+
+    def _get_metadata_local(self, identifier: str) -> Dict[str, Any]:
+        record = self._sessions.get(identifier)
+        if record is None or not record.metadata:
+            return {}
+        entry = _copy_record(record.metadata)
+        ts = entry.pop("updated_at", None)
+        if ts is not None:
+            entry["updated_at"] = datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat()
+        return entry
+
+    def _get_history_local(
+        self,
+        user_id: str,
+        conversation_id: str,
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        record = self._sessions.get(_identifier(user_id, conversation_id))
+        history = record.history if record is not None else ()
+        effective = limit or self._history_limit
+        result: List[Dict[str, Any]] = []
+        # Entries are appended in time order, so newest-first is a reverse walk.
+        for item in islice(reversed(history), effective):
+            entry = dict(item)
+            ts = entry.get("timestamp")
             if ts is not None:
-                entry["updated_at"] = datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat()
-            return entry
+                entry["timestamp"] = datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat()
+            result.append(entry)
+        return result
 
-        session = self._get_session(user_id, conversation_id)
-        if not self._use_gateway:
-            return self.get_metadata(user_id, conversation_id)
+    # ---- Gateway paths ------------------------------------------------------
+    def _persist_intent_gateway(
+        self,
+        user_id: str,
+        conversation_id: str,
+        intent: Dict[str, Any],
+        metadata: Dict[str, Any],
+        done: bool,
+        summary: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        if done:
+            if summary:
+                self._create_history_entry(user_id, conversation_id, summary)
+            self._delete_session(user_id, conversation_id)
+        else:
+            payload = self._session_payload(intent, metadata)
+            self._upsert_session(user_id, conversation_id, payload)
+        return self.get_history(user_id, conversation_id)
+
+    def _set_metadata_gateway(self, user_id: str, conversation_id: str, metadata: Dict[str, Any]) -> None:
+        if not metadata:
+            self._delete_session(user_id, conversation_id)
+            return
+        # PATCH merges server-side, so the stored intent is left untouched
+        # and no session GET is needed before the write.
+        payload = self._session_payload(None, metadata)
+        self._upsert_session(user_id, conversation_id, payload)
+
+    def _get_metadata_gateway(self, user_id: str, conversation_id: str, identifier: str) -> Dict[str, Any]:
+        session = self._fetch_session(identifier)
         if not session:
             return {}
 
-        intent = session.get("intent") or {}
+        session_get = session.get
+        intent_get = (session_get("intent") or {}).get
         metadata: Dict[str, Any] = {
-            "event": session.get("event"),
-            "status": session.get("status"),
-            "missing_fields": session.get("missingFields") or [],
-            "next_field": session.get("nextField"),
-            "pending_question": session.get("pendingQuestion"),
-            "choices": session.get("choices") or [],
-            "error": session.get("errorMessage"),
+            "event": session_get("event"),
+            "status": session_get("status"),
+            "missing_fields": session_get("missingFields") or [],
+            "next_field": session_get("nextField"),
+            "pending_question": session_get("pendingQuestion"),
+            "choices": session_get("choices") or [],
+            "error": session_get("errorMessage"),
             "user_id": user_id,
             "conversation_id": conversation_id,
+            "action": intent_get("action"),
+            "network": intent_get("network"),
+            "asset": intent_get("asset"),
+            "amount": intent_get("amount"),
         }
-        metadata["action"] = intent.get("action")
-        metadata["network"] = intent.get("network")
-        metadata["asset"] = intent.get("asset")
-        metadata["amount"] = intent.get("amount")
 
+        # Most conversations have no lending session, so history is only
+        # read once a session is known to exist.
         history = self.get_history(user_id, conversation_id)
         if history:
             metadata["history"] = history
@@ -247,79 +403,76 @@ class LendingStateRepository:
 
         return metadata
 
-    def get_history(
+    # ---- Gateway helpers --------------------------------------------------
+    @_gateway_call(on_404=(), on_error=None)
+    def _list_history(
         self,
         user_id: str,
         conversation_id: str,
-        limit: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
-        if not self._use_gateway:
-            key = _identifier(user_id, conversation_id)
-            history = self._state["history"].get(key, [])
-            effective = limit or self._history_limit
-            result: List[Dict[str, Any]] = []
-            for item in sorted(history, key=lambda entry: entry.get("timestamp", 0), reverse=True)[:effective]:
-                entry = copy.deepcopy(item)
-                ts = entry.get("timestamp")
-                if ts is not None:
-                    entry["timestamp"] = datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat()
-                result.append(entry)
-            return result
-
-        effective_limit = limit or self._history_limit
-        try:
-            result = self._client.list(
-                LENDING_HISTORY_ENTITY,
-                {
-                    "where": {"userId": user_id, "conversationId": conversation_id},
-                    "orderBy": {"recordedAt": "desc"},
-                    "take": effective_limit,
-                },
-            )
-        except PanoramaGatewayError as exc:
-            if exc.status_code == 404:
-                return []
-            self._handle_gateway_failure(exc)
-            return self.get_history(user_id, conversation_id, limit)
-        except ValueError:
-            self._logger.warning("Invalid lending history response from gateway; falling back to local store.")
-            self._fallback_to_local_store()
-            return self.get_history(user_id, conversation_id, limit)
+        limit: int,
+    ) -> Optional[Sequence[Dict[str, Any]]]:
+        result = self._client.list(
+            LENDING_HISTORY_ENTITY,
+            {
+                "where": {"userId": user_id, "conversationId": conversation_id},
+                "orderBy": {"recordedAt": "desc"},
+                "take": limit,
+            },
+        )
         data = result.get("data", []) if isinstance(result, dict) else []
-        history: List[Dict[str, Any]] = []
-        for entry in data:
-            history.append(
-                {
-                    "status": entry.get("status"),
-                    "action": entry.get("action"),
-                    "network": entry.get("network"),
-                    "asset": entry.get("asset"),
-                    "amount": entry.get("amount"),
-                    "error": entry.get("errorMessage"),
-                    "timestamp": entry.get("recordedAt"),
-                }
-            )
-        return history
+        return [{out: entry.get(src) for out, src in _HISTORY_FIELDS} for entry in data]
+
+    def _cache_session(self, identifier: str, session: Optional[Dict[str, Any]]) -> None:
+        with self._session_cache_lock:
+            self._session_cache[identifier] = (time.monotonic(), session)
+            self._session_cache.move_to_end(identifier)
+            if len(self._session_cache) > self._session_cache_size:
+                self._session_cache.popitem(last=False)
+
+    def _drop_cached_session(self, identifier: str) -> None:
+        with self._session_cache_lock:
+            self._session_cache.pop(identifier, None)
+
+    def _fresh_cache_entry(
+        self, identifier: str
+    ) -> Optional[Tuple[float, Optional[Dict[str, Any]]]]:
+        with self._session_cache_lock:
+            cached = self._session_cache.get(identifier)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] >= self._session_cache_ttl:
+                # Expired: evict now instead of leaving it for the LRU cap.
+                del self._session_cache[identifier]
+                return None
+            self._session_cache.move_to_end(identifier)
+            return cached
 
-    # ---- Gateway helpers --------------------------------------------------
     def _get_session(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
-        identifier = _identifier(user_id, conversation_id)
-        try:
-            return self._client.get(LENDING_SESSION_ENTITY, identifier)
-        except PanoramaGatewayError as exc:
-            if exc.status_code == 404:
-                return None
-            self._handle_gateway_failure(exc)
-            return None
+        return self._fetch_session(_identifier(user_id, conversation_id))
+
+    def _fetch_session(self, identifier: str) -> Optional[Dict[str, Any]]:
+        cached = self._fresh_cache_entry(identifier)
+        if cached is not None:
+            return cached[1]
+        # A gateway failure also yields None, but it switches the repository to
+        # the local store, after which the cache is no longer consulted.
+        session = self._gateway_get_session(identifier)
+        self._cache_session(identifier, session)
+        return session
+
+    @_gateway_call(on_404=None, on_error=None)
+    def _gateway_get_session(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return self._client.get(LENDING_SESSION_ENTITY, identifier)
 
     def _delete_session(self, user_id: str, conversation_id: str) -> None:
         identifier = _identifier(user_id, conversation_id)
-        try:
-            self._client.delete(LENDING_SESSION_ENTITY, identifier)
-        except PanoramaGatewayError as exc:
-            if exc.status_code != 404:
-                self._handle_gateway_failure(exc)
-                raise
+        self._drop_cached_session(identifier)
+        self._gateway_delete_session(identifier)
+        self._cache_session(identifier, None)
+
+    @_gateway_call(on_404=None)
+    def _gateway_delete_session(self, identifier: str) -> None:
+        self._client.delete(LENDING_SESSION_ENTITY, identifier)
 
     def _upsert_session(
         self,
@@ -329,8 +482,16 @@ class LendingStateRepository:
     ) -> None:
         identifier = _identifier(user_id, conversation_id)
         payload = {**data, "updatedAt": _utc_now_iso()}
+        cached = self._fresh_cache_entry(identifier)
+        self._drop_cached_session(identifier)
         try:
             self._client.update(LENDING_SESSION_ENTITY, identifier, payload)
+            # Partial writes (no intent) are merged into the cached session, the
+            # same way the gateway merges the PATCH.
+            if "intent" in payload:
+                self._cache_session(identifier, payload)
+            elif cached is not None and cached[1] is not None:
+                self._cache_session(identifier, {**cached[1], **payload})
         except PanoramaGatewayError as exc:
             if exc.status_code != 404:
                 self._handle_gateway_failure(exc)
@@ -339,10 +500,12 @@ class LendingStateRepository:
                 "userId": user_id,
                 "conversationId": conversation_id,
                 "tenantId": self._tenant_id(),
+                "intent": {},
                 **payload,
             }
             try:
                 self._client.create(LENDING_SESSION_ENTITY, create_payload)
+                self._cache_session(identifier, create_payload)
             except PanoramaGatewayError as create_exc:
                 if create_exc.status_code == 409:
                     return
@@ -358,15 +521,16 @@ class LendingStateRepository:
         conversation_id: str,
         summary: Dict[str, Any],
     ) -> None:
+        summary_get = summary.get
         history_payload = {
             "userId": user_id,
             "conversationId": conversation_id,
-            "status": summary.get("status"),
-            "action": summary.get("action"),
-            "network": summary.get("network"),
-            "asset": summary.get("asset"),
-            "amount": _as_float(summary.get("amount")),
-            "errorMessage": summary.get("error"),
+            "status": summary_get("status"),
+            "action": summary_get("action"),
+            "network": summary_get("network"),
+            "asset": summary_get("asset"),
+            "amount": _as_float(summary_get("amount")),
+            "errorMessage": summary_get("error"),
             "recordedAt": _utc_now_iso(),
             "tenantId": self._tenant_id(),
         }
@@ -388,18 +552,23 @@ class LendingStateRepository:
                 raise
 
     @staticmethod
-    def _session_payload(intent: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        missing = metadata.get("missing_fields") or []
-        if not isinstance(missing, list):
-            missing = list(missing)
-        return {
-            "status": metadata.get("status"),
-            "event": metadata.get("event"),
-            "intent": intent,
-            "missingFields": missing,
-            "nextField": metadata.get("next_field"),
-            "pendingQuestion": metadata.get("pending_question"),
-            "choices": metadata.get("choices"),
-            "errorMessage": metadata.get("error"),
-            "historyCursor": metadata.get("history_cursor") or 0,
+    def _session_payload(
+        intent: Optional[Dict[str, Any]], metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build a session write; ``intent=None`` leaves the stored intent as is."""
+        # ``missing_fields`` is always built as a list by the lending tools
+        # (LendingIntent.missing_fields), so it is passed through as-is.
+        md_get = metadata.get
+        payload: Dict[str, Any] = {
+            "status": md_get("status"),
+            "event": md_get("event"),
+            "missingFields": md_get("missing_fields") or [],
+            "nextField": md_get("next_field"),
+            "pendingQuestion": md_get("pending_question"),
+            "choices": md_get("choices"),
+            "errorMessage": md_get("error"),
+            "historyCursor": md_get("history_cursor") or 0,
         }
+        if intent is not None:
+            payload["intent"] = intent
+        return payload
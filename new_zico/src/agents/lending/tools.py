@@ -4,17 +4,19 @@ from __future__ import annotations
 
 import logging
 import time
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from contextvars import ContextVar
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional
+from threading import RLock
+from typing import Any, Dict, Final, List, Optional, Sequence
 
 from langchain_core.tools import tool
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from src.agents.metadata import metadata
 from src.agents.lending.config import LendingConfig
-from src.agents.lending.intent import LendingIntent, _to_decimal
+from src.agents.lending.intent import LendingIntent, LendingMeta, _to_decimal
 from src.agents.lending.storage import LendingStateRepository
 
 
@@ -22,11 +24,39 @@ from src.agents.lending.storage import LendingStateRepository
 _STORE = LendingStateRepository.instance()
 logger = logging.getLogger(__name__)
 
+# Static config snapshots handed out as choices; tuples so they are never copied.
+_ACTIONS = tuple(LendingConfig.SUPPORTED_ACTIONS)
+_NETWORKS = tuple(LendingConfig.list_networks())
+_ASSETS_BY_NET = {net: tuple(LendingConfig.list_assets(net)) for net in _NETWORKS}
+
 
 # ---------- Lending session context ----------
+_EMPTY_SESSION: Final[tuple[str, str]] = ("", "")
 _CURRENT_SESSION: ContextVar[tuple[str, str]] = ContextVar(
     "_current_lending_session",
-    default=("", ""),
+    default=_EMPTY_SESSION,
+)
+
+
+@dataclass(slots=True)
+class _PendingWrites:
+    """Lending writes and the loaded intent, scoped to the active session.
+
+    Mutated in place so tool calls running in a copied context still share it.
+    ToolNode runs parallel tool calls in separate threads, so each call holds
+    ``lock`` for its whole load/update/record cycle; it is re-entrant because
+    that cycle may flush.
+    """
+
+    records: List[tuple] = field(default_factory=list)
+    history: Optional[List[Dict[str, Any]]] = None
+    intent: Optional[LendingIntent] = None
+    lock: RLock = field(default_factory=RLock)
+
+
+_PENDING_PERSIST: ContextVar[Optional[_PendingWrites]] = ContextVar(
+    "_pending_lending_persist",
+    default=None,
 )
 
 
@@ -47,22 +77,28 @@ def lending_session(user_id: Optional[str], conversation_id: Optional[str]):
     """Context manager that guarantees session scoping for lending tool calls."""
 
     set_current_lending_session(user_id, conversation_id)
+    pending_token = _PENDING_PERSIST.set(_PendingWrites())
     try:
         yield
     finally:
-        clear_current_lending_session()
+        try:
+            flush_pending_persist()
+        finally:
+            _PENDING_PERSIST.reset(pending_token)
+            clear_current_lending_session()
 
 
 def clear_current_lending_session() -> None:
     """Reset the active lending session after the agent finishes handling a message."""
 
-    _CURRENT_SESSION.set(("", ""))
+    _CURRENT_SESSION.set(_EMPTY_SESSION)
 
 
 def _resolve_session(user_id: Optional[str], conversation_id: Optional[str]) -> tuple[str, str]:
     active_user, active_conversation = _CURRENT_SESSION.get()
-    resolved_user = (user_id or active_user or "").strip()
-    resolved_conversation = (conversation_id or active_conversation or "").strip()
+    # The active session is stored stripped and non-empty, so it needs no re-strip.
+    resolved_user = user_id.strip() if user_id else active_user
+    resolved_conversation = conversation_id.strip() if conversation_id else active_conversation
     if not resolved_user:
         raise ValueError("user_id is required for lending operations.")
     if not resolved_conversation:
@@ -71,16 +107,33 @@ def _resolve_session(user_id: Optional[str], conversation_id: Optional[str]) ->
 
 
 def _load_intent(user_id: str, conversation_id: str) -> LendingIntent:
+    pending = _PENDING_PERSIST.get()
+    if pending is not None:
+        cached = pending.intent
+        if (
+            cached is not None
+            and cached.user_id == user_id
+            and cached.conversation_id == conversation_id
+        ):
+            return cached
+
     stored = _STORE.load_intent(user_id, conversation_id)
     if stored:
         intent = LendingIntent.from_dict(stored)
         intent.user_id = user_id
         intent.conversation_id = conversation_id
-        return intent
-    return LendingIntent(user_id=user_id, conversation_id=conversation_id)
+    else:
+        intent = LendingIntent(user_id=user_id, conversation_id=conversation_id)
+    if pending is not None:
+        pending.intent = intent
+    return intent
 
 
 # ---------- Pydantic input schema ----------
+_ZERO = Decimal("0")
+_INPUT_NORMALIZERS = (("network", str.lower), ("asset", str.upper), ("action", str.lower))
+
+
 class UpdateLendingIntentInput(BaseModel):
     user_id: Optional[str] = Field(
         default=None,
@@ -93,22 +146,21 @@ class UpdateLendingIntentInput(BaseModel):
     action: Optional[str] = None
     network: Optional[str] = None
     asset: Optional[str] = None
-    amount: Optional[Decimal] = Field(None, gt=Decimal("0"))
-
-    @field_validator("network", mode="before")
-    @classmethod
-    def _norm_network(cls, value: Optional[str]) -> Optional[str]:
-        return value.lower() if isinstance(value, str) else value
+    # _norm_amount already coerces to Decimal; strict skips pydantic's own coercion pass.
+    amount: Optional[Decimal] = Field(None, gt=_ZERO, strict=True)
 
-    @field_validator("asset", mode="before")
+    @model_validator(mode="before")
     @classmethod
-    def _norm_asset(cls, value: Optional[str]) -> Optional[str]:
-        return value.upper() if isinstance(value, str) else value
-    
-    @field_validator("action", mode="before")
-    @classmethod
-    def _norm_action(cls, value: Optional[str]) -> Optional[str]:
-        return value.lower() if isinstance(value, str) else value
+    def _normalize(cls, data: Any) -> Any:
+        # One pass over the string fields instead of a validator per field.
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        for key, normalize in _INPUT_NORMALIZERS:
+            value = data.get(key)
+            if isinstance(value, str):
+                data[key] = normalize(value)
+        return data
 
     @field_validator("amount", mode="before")
     @classmethod
@@ -149,24 +201,19 @@ def _validate_amount(amount: Optional[Decimal], intent) -> Optional[Decimal]:
         raise ValueError("Provide the network and asset before specifying an amount.")
 
     policy = LendingConfig.get_asset_policy(intent.network, intent.asset)
-    min_amount = _to_decimal(policy.get("min_amount"))
-    max_amount = _to_decimal(policy.get("max_amount"))
+    min_amount = policy["min_amount"]
+    max_amount = policy["max_amount"]
 
-    if min_amount is not None and amount < min_amount:
+    if amount < min_amount:
         raise ValueError(
             f"The minimum amount for {intent.asset} on {intent.network} is {min_amount}."
         )
-    if max_amount is not None and amount > max_amount:
+    if amount > max_amount:
         raise ValueError(
             f"The maximum amount for {intent.asset} on {intent.network} is {max_amount}."
         )
 
-    decimals_value = policy.get("decimals", 18)
-    try:
-        decimals = int(decimals_value)
-    except (TypeError, ValueError):
-        decimals = 18
-
+    decimals = policy["decimals"]
     if decimals >= 0 and amount.as_tuple().exponent < -decimals:
         raise ValueError(
             f"Amount precision exceeds {decimals} decimal places allowed for {intent.asset}."
@@ -181,52 +228,103 @@ def _store_lending_metadata(
     ask: Optional[str],
     done: bool,
     error: Optional[str],
-    choices: Optional[List[str]] = None,
-) -> Dict[str, Any]:
-    intent.touch()
+    choices: Sequence[str] = (),
+) -> tuple[LendingMeta, Dict[str, Any]]:
+    pending = _PENDING_PERSIST.get()
+    if pending is None:
+        intent.touch()
     missing = intent.missing_fields()
-    next_field = missing[0] if missing else None
-    meta: Dict[str, Any] = {
-        "event": "lending_intent_ready" if done else "lending_intent_pending",
-        "status": "ready" if done else "collecting",
-        "action": intent.action,
-        "network": intent.network,
-        "asset": intent.asset,
-        "amount": intent.amount_as_str(),
-        "user_id": intent.user_id,
-        "conversation_id": intent.conversation_id,
-        "missing_fields": missing,
-        "next_field": next_field,
-        "pending_question": ask,
-        "choices": list(choices or []),
-        "error": error,
-    }
-    summary = intent.to_summary("ready" if done else "collecting", error=error) if done else None
-    history = _STORE.persist_intent(
-        intent.user_id,
-        intent.conversation_id,
-        intent.to_dict(),
-        meta,
-        done=done,
-        summary=summary,
+    meta = LendingMeta(
+        event="lending_intent_ready" if done else "lending_intent_pending",
+        status="ready" if done else "collecting",
+        action=intent.action,
+        network=intent.network,
+        asset=intent.asset,
+        amount=intent.amount_as_str(),
+        user_id=intent.user_id,
+        conversation_id=intent.conversation_id,
+        missing_fields=missing,
+        next_field=missing[0] if missing else None,
+        pending_question=ask,
+        choices=choices,
+        error=error,
     )
-    if history:
-        meta["history"] = history
-    metadata.set_lending_agent(meta, intent.user_id, intent.conversation_id)
+    summary = intent.to_summary("ready" if done else "collecting", error=error) if done else None
+    # One serialisation serves both the stored record and the tool payload.
+    intent_data = intent.to_dict()
+    record = (intent.user_id, intent.conversation_id, intent_data, meta, done, summary)
+    if pending is None:
+        _write_record(record)
+    else:
+        if pending.records and pending.records[-1][:2] != record[:2]:
+            # Explicit ids switched sessions mid-turn; keep one record per session.
+            flush_pending_persist()
+            pending.history = None
+        pending.records.append(record)
+        if done:
+            # Terminal state: write now so the response carries the updated history.
+            # The store drops a completed intent, so the next call starts afresh.
+            pending.intent = None
+            flush_pending_persist()
+        else:
+            if pending.history is None:
+                pending.history = _STORE.get_history(intent.user_id, intent.conversation_id)
+            if pending.history:
+                meta.history = pending.history
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(
-            "Lending metadata stored for user=%s conversation=%s done=%s error=%s meta=%s",
+            "Lending metadata stored for user=%s conversation=%s status=%s next_field=%s error=%s",
             intent.user_id,
             intent.conversation_id,
-            done,
+            meta.status,
+            meta.next_field,
             error,
-            meta,
         )
-    return meta
+    return meta, intent_data
+
+
+def _write_record(record: tuple) -> Optional[List[Dict[str, Any]]]:
+    user_id, conversation_id, intent_data, meta, done, summary = record
+    history = _STORE.persist_intent(
+        user_id,
+        conversation_id,
+        intent_data,
+        meta.to_dict(),
+        done=done,
+        summary=summary,
+    )
+    if history:
+        meta.history = history
+    metadata.set_lending_agent(meta.to_dict(), user_id, conversation_id)
+    return history
+
 
+def flush_pending_persist() -> None:
+    """Write the last deferred lending record of the active session, if any.
+
+    Inside ``lending_session`` non-terminal updates are only buffered, so the
+    store and ``metadata.get_lending_agent`` keep the state from before the turn
+    (``{}`` for a new conversation) until this runs: when the session closes,
+    when an intent completes, or when explicit ids switch sessions. Every
+    buffered record carries the cumulative intent, so the last one is enough.
+    """
 
-def _build_next_action(meta: Dict[str, Any]) -> Dict[str, Any]:
-    if meta.get("status") == "ready":
+    pending = _PENDING_PERSIST.get()
+    if pending is None:
+        return
+    with pending.lock:
+        if not pending.records:
+            return
+        record = pending.records[-1]
+        pending.records.clear()
+        # Deferred records are stamped once here instead of on every tool call. The
+        # intent dict is shared with an already returned payload, so replace it.
+        record = record[:2] + ({**record[2], "updated_at": time.time()},) + record[3:]
+        pending.history = _write_record(record)
+
+
+def _build_next_action(meta: LendingMeta) -> Dict[str, Any]:
+    if meta.status == "ready":
         return {
             "type": "complete",
             "prompt": None,
@@ -235,47 +333,52 @@ def _build_next_action(meta: Dict[str, Any]) -> Dict[str, Any]:
         }
     return {
         "type": "collect_field",
-        "prompt": meta.get("pending_question"),
-        "field": meta.get("next_field"),
-        "choices": meta.get("choices", []),
+        "prompt": meta.pending_question,
+        "field": meta.next_field,
+        "choices": meta.choices,
     }
 
 
+# LendingMeta fields copied (when set) into the metadata of a ready response.
+_DONE_KEYS: Final = (
+    "event",
+    "status",
+    "action",
+    "network",
+    "asset",
+    "amount",
+    "user_id",
+    "conversation_id",
+    "history",
+)
+
+
 def _response(
     intent: LendingIntent,
     ask: Optional[str],
-    choices: Optional[List[str]] = None,
+    choices: Sequence[str] = (),
     done: bool = False,
     error: Optional[str] = None,
 ) -> Dict[str, Any]:
-    meta = _store_lending_metadata(intent, ask, done, error, choices)
+    meta, intent_data = _store_lending_metadata(intent, ask, done, error, choices)
 
     payload: Dict[str, Any] = {
-        "event": meta.get("event"),
-        "intent": intent.to_public(),
+        "event": meta.event,
+        "intent": intent_data,
         "ask": ask,
-        "choices": choices or [],
+        "choices": choices,
         "error": error,
         "next_action": _build_next_action(meta),
-        "history": meta.get("history", []),
+        "history": meta.history or [],
     }
 
     if done:
-        payload["metadata"] = {
-            key: meta.get(key)
-            for key in (
-                "event",
-                "status",
-                "action",
-                "network",
-                "asset",
-                "amount",
-                "user_id",
-                "conversation_id",
-                "history",
-            )
-            if meta.get(key) is not None
-        }
+        done_metadata: Dict[str, Any] = {}
+        for key in _DONE_KEYS:
+            value = getattr(meta, key)
+            if value is not None:
+                done_metadata[key] = value
+        payload["metadata"] = done_metadata
     return payload
 
 
@@ -296,6 +399,19 @@ def update_lending_intent_tool(
     and keep calling it until the response event becomes 'lending_intent_ready'.
     """
 
+    pending = _PENDING_PERSIST.get()
+    with pending.lock if pending is not None else nullcontext():
+        return _update_lending_intent(user_id, conversation_id, action, network, asset, amount)
+
+
+def _update_lending_intent(
+    user_id: Optional[str],
+    conversation_id: Optional[str],
+    action: Optional[str],
+    network: Optional[str],
+    asset: Optional[str],
+    amount: Optional[Decimal],
+) -> Dict[str, Any]:
     resolved_user, resolved_conversation = _resolve_session(user_id, conversation_id)
     intent = _load_intent(resolved_user, resolved_conversation)
     intent.user_id = resolved_user
@@ -332,7 +448,7 @@ def update_lending_intent_tool(
              return _response(
                 intent,
                 "What would you like to do? (supply, borrow, repay, withdraw)",
-                LendingConfig.SUPPORTED_ACTIONS,
+                _ACTIONS,
             )
 
         if intent.network is None and network is not None:
@@ -343,7 +459,7 @@ def update_lending_intent_tool(
              return _response(
                 intent,
                 "On which network?",
-                LendingConfig.list_networks(),
+                _NETWORKS,
             )
 
         if asset is not None:
@@ -353,7 +469,7 @@ def update_lending_intent_tool(
             return _response(
                 intent,
                 f"Which asset on {intent.network}?",
-                LendingConfig.list_assets(intent.network),
+                _ASSETS_BY_NET.get(intent.network, ()),
             )
 
         if amount is not None:
@@ -373,11 +489,12 @@ def update_lending_intent_tool(
             )
         return _response(intent, "Please correct the input.", error=message)
     except Exception as exc:
-        logger.exception(
-            "Unexpected error updating lending intent for user=%s conversation=%s",
-            intent.user_id,
-            intent.conversation_id,
-        )
+        if logger.isEnabledFor(logging.ERROR):
+            logger.exception(
+                "Unexpected error updating lending intent for user=%s conversation=%s",
+                intent.user_id,
+                intent.conversation_id,
+            )
         return _response(intent, "Please try again with the lending details.", error=str(exc))
 
     response = _response(intent, ask=None, done=True)
@@ -399,15 +516,14 @@ def list_lending_assets_tool(network: str):
 
     try:
         canonical = _validate_network(network)
-        assets = LendingConfig.list_assets(canonical)
         return {
             "network": canonical,
-            "assets": assets,
+            "assets": _ASSETS_BY_NET.get(canonical, ()),
         }
     except ValueError as exc:
         return {
             "error": str(exc),
-            "choices": LendingConfig.list_networks(),
+            "choices": _NETWORKS,
         }
 
 
@@ -415,8 +531,11 @@ def list_lending_assets_tool(network: str):
 def list_lending_networks_tool():
     """List supported lending networks."""
 
-    return {"networks": LendingConfig.list_networks()}
+    return {"networks": _NETWORKS}
+
+
+_TOOLS = (update_lending_intent_tool, list_lending_assets_tool, list_lending_networks_tool)
 
 
 def get_tools():
-    return [update_lending_intent_tool, list_lending_assets_tool, list_lending_networks_tool]
+    return list(_TOOLS)
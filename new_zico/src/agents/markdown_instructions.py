@@ -5,7 +5,9 @@ Ensures LLMs produce clean, well-structured markdown that the frontend
 react-markdown renderer can display properly.
 """
 
-MARKDOWN_INSTRUCTIONS = """
+from typing import Final
+
+MARKDOWN_INSTRUCTIONS: Final[str] = """
 
 ## Response Formatting Rules
 
@@ -19,6 +19,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_RECENT = 8
+_TRANSCRIPT_MAX_MESSAGES = 30
 
 
 def prepare_context(
@@ -36,9 +37,12 @@ def prepare_context(
         return messages
 
     recent = messages[-max_recent:]
-    older = messages[:-max_recent]
+    if not summarizer_llm:
+        # No summariser → just keep the recent window
+        return recent
 
-    if summarizer_llm and older:
+    older = messages[:-max_recent]
+    if older:
         summary = _summarize(older, summarizer_llm)
         if summary:
             summary_msg: Dict[str, Any] = {
@@ -47,7 +51,6 @@ def prepare_context(
             }
             return [summary_msg] + recent
 
-    # No summariser → just keep the recent window
     return recent
 
 
@@ -57,13 +60,14 @@ def _summarize(
 ) -> Optional[str]:
     """Summarise *messages* into a compact paragraph."""
     try:
+        # Only the last 30 messages make it into the transcript, so only format those.
         transcript_lines: list[str] = []
-        for msg in messages:
+        for msg in messages[-_TRANSCRIPT_MAX_MESSAGES:]:
             role = msg.get("role", "user")
             content = (msg.get("content") or "")[:500]  # cap per message
             transcript_lines.append(f"{role}: {content}")
 
-        transcript = "\n".join(transcript_lines[-30:])  # last 30 msgs max
+        transcript = "\n".join(transcript_lines)
 
         prompt = (
             "Summarise the following conversation excerpt in 2-4 concise "
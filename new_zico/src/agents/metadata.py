@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partialmethod
 from typing import Any, Dict
 
 from src.agents.swap.storage import SwapStateRepository
@@ -8,13 +9,19 @@ from src.agents.lending.storage import LendingStateRepository
 from src.agents.staking.storage import StakingStateRepository
 
 
+# Domains backed by a state repository; each gets get/set/clear/history wrappers.
+_DOMAIN_REPOS = {
+    "swap": SwapStateRepository,
+    "dca": DcaStateRepository,
+    "lending": LendingStateRepository,
+    "staking": StakingStateRepository,
+}
+
+
 class Metadata:
     def __init__(self):
         self.crypto_data_agent: Dict[str, Any] = {}
-        self._swap_repo = SwapStateRepository.instance()
-        self._dca_repo = DcaStateRepository.instance()
-        self._lending_repo = LendingStateRepository.instance()
-        self._staking_repo = StakingStateRepository.instance()
+        self._repos = {domain: repo.instance() for domain, repo in _DOMAIN_REPOS.items()}
 
     def get_crypto_data_agent(self):
         return self.crypto_data_agent
@@ -22,148 +29,67 @@ class Metadata:
     def set_crypto_data_agent(self, crypto_data_agent):
         self.crypto_data_agent = crypto_data_agent
 
-    def get_swap_agent(self, user_id: str | None = None, conversation_id: str | None = None):
+    def _get_agent(self, domain: str, user_id: str | None = None, conversation_id: str | None = None):
         try:
-            return self._swap_repo.get_metadata(user_id, conversation_id)
+            return self._repos[domain].get_metadata(user_id, conversation_id)
         except ValueError:
             return {}
 
-    def set_swap_agent(
+    def _set_agent(
         self,
-        swap_agent: Dict[str, Any] | None,
+        domain: str,
+        agent_metadata: Dict[str, Any] | None,
         user_id: str | None = None,
         conversation_id: str | None = None,
     ):
+        repo = self._repos[domain]
         try:
-            if swap_agent:
-                self._swap_repo.set_metadata(user_id, conversation_id, swap_agent)
+            if agent_metadata is None:
+                repo.clear_metadata(user_id, conversation_id)
             else:
-                self._swap_repo.clear_metadata(user_id, conversation_id)
+                repo.set_metadata(user_id, conversation_id, agent_metadata)
         except ValueError:
             # Ignore clears when identity is missing; no actionable state to update.
             return
 
-    def get_dca_agent(self, user_id: str | None = None, conversation_id: str | None = None):
+    def _clear_agent(self, domain: str, user_id: str | None = None, conversation_id: str | None = None) -> None:
         try:
-            return self._dca_repo.get_metadata(user_id, conversation_id)
-        except ValueError:
-            return {}
-
-    def set_dca_agent(
-        self,
-        dca_agent: Dict[str, Any] | None,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-    ):
-        try:
-            if dca_agent:
-                self._dca_repo.set_metadata(user_id, conversation_id, dca_agent)
-            else:
-                self._dca_repo.clear_metadata(user_id, conversation_id)
-        except ValueError:
-            return
-
-    def clear_dca_agent(self, user_id: str | None = None, conversation_id: str | None = None) -> None:
-        try:
-            self._dca_repo.clear_metadata(user_id, conversation_id)
+            self._repos[domain].clear_metadata(user_id, conversation_id)
         except ValueError:
             return
 
-    def get_dca_history(
-        self,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-        limit: int | None = None,
-    ):
-        try:
-            return self._dca_repo.get_history(user_id, conversation_id, limit)
-        except ValueError:
-            return []
-
-    def get_swap_history(
+    def _get_history(
         self,
+        domain: str,
         user_id: str | None = None,
         conversation_id: str | None = None,
         limit: int | None = None,
     ):
         try:
-            return self._swap_repo.get_history(user_id, conversation_id, limit)
+            return self._repos[domain].get_history(user_id, conversation_id, limit)
         except ValueError:
             return []
 
-    def get_lending_agent(self, user_id: str | None = None, conversation_id: str | None = None):
-        try:
-            return self._lending_repo.get_metadata(user_id, conversation_id)
-        except ValueError:
-            return {}
-
-    def set_lending_agent(
-        self,
-        lending_agent: Dict[str, Any] | None,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-    ):
-        try:
-            if lending_agent:
-                self._lending_repo.set_metadata(user_id, conversation_id, lending_agent)
-            else:
-                self._lending_repo.clear_metadata(user_id, conversation_id)
-        except ValueError:
-            return
-
-    def clear_lending_agent(self, user_id: str | None = None, conversation_id: str | None = None) -> None:
-        try:
-            self._lending_repo.clear_metadata(user_id, conversation_id)
-        except ValueError:
-            return
-
-    def get_lending_history(
-        self,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-        limit: int | None = None,
-    ):
-        try:
-            return self._lending_repo.get_history(user_id, conversation_id, limit)
-        except ValueError:
-            return []
-
-    def get_staking_agent(self, user_id: str | None = None, conversation_id: str | None = None):
-        try:
-            return self._staking_repo.get_metadata(user_id, conversation_id)
-        except ValueError:
-            return {}
-
-    def set_staking_agent(
-        self,
-        staking_agent: Dict[str, Any] | None,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-    ):
-        try:
-            if staking_agent:
-                self._staking_repo.set_metadata(user_id, conversation_id, staking_agent)
-            else:
-                self._staking_repo.clear_metadata(user_id, conversation_id)
-        except ValueError:
-            return
-
-    def clear_staking_agent(self, user_id: str | None = None, conversation_id: str | None = None) -> None:
-        try:
-            self._staking_repo.clear_metadata(user_id, conversation_id)
-        except ValueError:
-            return
-
-    def get_staking_history(
-        self,
-        user_id: str | None = None,
-        conversation_id: str | None = None,
-        limit: int | None = None,
-    ):
-        try:
-            return self._staking_repo.get_history(user_id, conversation_id, limit)
-        except ValueError:
-            return []
+    # Public per-domain accessors.
+    get_swap_agent = partialmethod(_get_agent, "swap")
+    set_swap_agent = partialmethod(_set_agent, "swap")
+    clear_swap_agent = partialmethod(_clear_agent, "swap")
+    get_swap_history = partialmethod(_get_history, "swap")
+
+    get_dca_agent = partialmethod(_get_agent, "dca")
+    set_dca_agent = partialmethod(_set_agent, "dca")
+    clear_dca_agent = partialmethod(_clear_agent, "dca")
+    get_dca_history = partialmethod(_get_history, "dca")
+
+    get_lending_agent = partialmethod(_get_agent, "lending")
+    set_lending_agent = partialmethod(_set_agent, "lending")
+    clear_lending_agent = partialmethod(_clear_agent, "lending")
+    get_lending_history = partialmethod(_get_history, "lending")
+
+    get_staking_agent = partialmethod(_get_agent, "staking")
+    set_staking_agent = partialmethod(_set_agent, "staking")
+    clear_staking_agent = partialmethod(_clear_agent, "staking")
+    get_staking_history = partialmethod(_get_history, "staking")
 
 
 metadata = Metadata()
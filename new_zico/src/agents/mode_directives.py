@@ -137,11 +137,20 @@ Assign a numeric health score (e.g. 7.2/10).  Justify every recommendation.\
 # Public API
 # ---------------------------------------------------------------------------
 
+# Directives keyed by mode; unknown modes fall back to fast.
+_GENERIC_DIRECTIVES: dict[str, str] = {
+    "fast": FAST_DIRECTIVE,
+    "reasoning": REASONING_DIRECTIVE,
+}
+_AGENT_DIRECTIVES: dict[str, dict[str, str]] = {
+    "reasoning": _AGENT_REASONING_OVERRIDES,
+}
+_NO_OVERRIDES: dict[str, str] = {}
+
+
 def get_generic_directive(mode: str) -> str:
     """Return the generic directive block for the given mode."""
-    if mode == "reasoning":
-        return REASONING_DIRECTIVE
-    return FAST_DIRECTIVE
+    return _GENERIC_DIRECTIVES.get(mode, FAST_DIRECTIVE)
 
 
 def get_agent_directive(agent_key: str, mode: str) -> str | None:
@@ -149,6 +158,4 @@ def get_agent_directive(agent_key: str, mode: str) -> str | None:
 
     Only reasoning mode has per-agent overrides.  Fast mode always returns None.
     """
-    if mode != "reasoning":
-        return None
-    return _AGENT_REASONING_OVERRIDES.get(agent_key)
+    return _AGENT_DIRECTIVES.get(mode, _NO_OVERRIDES).get(agent_key)
@@ -5,21 +5,47 @@ web search to produce risk analysis and swap recommendations.
 
 import logging
 
+from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
 
 from src.agents.portfolio.prompt import PORTFOLIO_ADVISOR_SYSTEM_PROMPT
 from src.agents.portfolio.tools import get_tools as get_portfolio_tools
-from src.agents.search.tools import get_tools as get_search_tools
+from src.llm import LLMInvalidModelError, detect_provider
 
 logger = logging.getLogger(__name__)
 
 
+def _system_prompt(llm):
+    """Return the system prompt, marked as a prompt-cache breakpoint on Anthropic.
+
+    The prompt is the static prefix of every turn.  Anthropic only caches
+    blocks tagged with ``cache_control``; Gemini and OpenAI cache a stable
+    prefix implicitly, so they get the plain string.
+    """
+    model = getattr(llm, "model", None)
+    try:
+        provider = detect_provider(model) if isinstance(model, str) else None
+    except LLMInvalidModelError:
+        provider = None
+    if provider != "anthropic":
+        return PORTFOLIO_ADVISOR_SYSTEM_PROMPT
+    return SystemMessage(content=[{
+        "type": "text",
+        "text": PORTFOLIO_ADVISOR_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }])
+
+
 class PortfolioAdvisorAgent:
     """Agent that analyses on-chain portfolio data and recommends actions."""
 
     def __init__(self, llm):
         self.llm = llm
 
+        # Imported here so loading this module does not pull in the search
+        # agent's toolset; only building the advisor needs it.
+        from src.agents.search.tools import get_tools as get_search_tools
+
         # Combine portfolio tools + search tools so the agent can
         # both read the wallet AND look up recent news for held tokens.
         tools = get_portfolio_tools() + get_search_tools()
@@ -28,5 +54,5 @@ class PortfolioAdvisorAgent:
             model=llm,
             tools=tools,
             name="portfolio_advisor",
-            prompt=PORTFOLIO_ADVISOR_SYSTEM_PROMPT,
+            prompt=_system_prompt(llm),
         )
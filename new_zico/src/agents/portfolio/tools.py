@@ -15,16 +15,17 @@ node rather than asked from the user.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from contextvars import ContextVar
-from threading import Lock
+from threading import Lock, Thread
 from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
 from langchain_core.tools import tool
 from pydantic import BaseModel
 
@@ -40,7 +41,41 @@ from src.agents.portfolio.config import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
+
+
+def _json_loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(payload: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
+
 _HTTP_TIMEOUT = 15  # seconds per request
+_WALLET_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+# Token decimals are small non-negative ints (6, 8, 18, ...); look the scale up
+# instead of computing a power per token.
+_POW10 = tuple(10 ** i for i in range(37))
+_POW10_SIZE = len(_POW10)
+# Every chain issues two requests; allow all of them to be in flight at once.
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_HTTP_RETRIES = 2
+_HTTP_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_HTTP_BACKOFF = 0.2  # seconds, doubled per retry
 
 # ---------------------------------------------------------------------------
 # Session context (user_id, conversation_id, wallet_address)
@@ -83,97 +118,187 @@ def portfolio_session(
 
 
 # ---------------------------------------------------------------------------
-# Simple TTL cache (avoids hammering explorers on follow-up questions)
+# Simple TTL cache of per-chain holdings (avoids hammering explorers on
+# follow-up questions)
 # ---------------------------------------------------------------------------
 
+# Entries are (value, expires_at); insertion order tracks age for eviction.
 _PORTFOLIO_CACHE: Dict[str, tuple[Any, float]] = {}
 _CACHE_TTL = 60  # seconds
-_cache_lock = Lock()
+_CACHE_MAX_ENTRIES = 1024
+_cache_lock = Lock()  # serialises writers only
 
 
 def _get_cached(key: str) -> Optional[Any]:
-    with _cache_lock:
-        entry = _PORTFOLIO_CACHE.get(key)
-        if entry and (time.time() - entry[1]) < _CACHE_TTL:
-            return entry[0]
-        return None
+    # A single dict.get is atomic under the GIL, so reads skip the lock.
+    entry = _PORTFOLIO_CACHE.get(key)
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    return None
 
 
 def _set_cached(key: str, value: Any) -> None:
+    now = time.monotonic()
     with _cache_lock:
-        _PORTFOLIO_CACHE[key] = (value, time.time())
+        if key not in _PORTFOLIO_CACHE and len(_PORTFOLIO_CACHE) >= _CACHE_MAX_ENTRIES:
+            expired = [k for k, (_, expires_at) in _PORTFOLIO_CACHE.items() if expires_at <= now]
+            for k in expired:
+                del _PORTFOLIO_CACHE[k]
+            while len(_PORTFOLIO_CACHE) >= _CACHE_MAX_ENTRIES:
+                del _PORTFOLIO_CACHE[next(iter(_PORTFOLIO_CACHE))]
+        _PORTFOLIO_CACHE.pop(key, None)
+        _PORTFOLIO_CACHE[key] = (value, now + _CACHE_TTL)
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP client
+# ---------------------------------------------------------------------------
+# The explorers are hit with the same few hosts on every fetch, so a single
+# long-lived AsyncClient keeps their TLS connections alive between portfolios.
+# An async client is tied to one event loop, so it lives on a dedicated
+# background loop that tool threads submit work to.
+
+_HTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+_http_loop_lock = Lock()
+
+
+def _http_loop() -> asyncio.AbstractEventLoop:
+    global _HTTP_LOOP
+    with _http_loop_lock:
+        if _HTTP_LOOP is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, name="portfolio-http", daemon=True).start()
+            _HTTP_LOOP = loop
+        return _HTTP_LOOP
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Return the shared client; only called from coroutines on the HTTP loop."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=_HTTP_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(retries=_HTTP_RETRIES, limits=_HTTP_LIMITS),
+        )
+    return _HTTP_CLIENT
+
+
+async def _get(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """GET *url*, retrying rate-limit and gateway errors with backoff."""
+    delay = _HTTP_BACKOFF
+    for _ in range(_HTTP_RETRIES):
+        resp = await client.get(url)
+        if resp.status_code not in _HTTP_RETRY_STATUSES:
+            break
+        await asyncio.sleep(delay)
+        delay *= 2
+    else:
+        resp = await client.get(url)
+    resp.raise_for_status()
+    return resp
+
+
+async def _get_items(
+    client: httpx.AsyncClient, url: str, key: Optional[str] = None
+) -> List[Any]:
+    """GET a JSON array: the whole body, or the array under *key*.
+
+    Token lists for large wallets run to megabytes.  With ijson installed the
+    array is parsed while it downloads, so the raw body is never held in
+    memory next to the parsed items.
+    """
+    if ijson is None:
+        data = _json_loads((await _get(client, url)).content)
+        return data if key is None else data.get(key, [])
+
+    prefix = "item" if key is None else f"{key}.item"
+    delay = _HTTP_BACKOFF
+    for attempt in range(_HTTP_RETRIES + 1):
+        async with client.stream("GET", url) as resp:
+            if attempt == _HTTP_RETRIES or resp.status_code not in _HTTP_RETRY_STATUSES:
+                resp.raise_for_status()
+                items = ijson.sendable_list()
+                parser = ijson.items_coro(items, prefix, use_float=True)
+                async for chunk in resp.aiter_bytes():
+                    parser.send(chunk)
+                parser.close()
+                return items
+        await asyncio.sleep(delay)
+        delay *= 2
+    return []
 
 
 # ---------------------------------------------------------------------------
 # Blockscout helpers
 # ---------------------------------------------------------------------------
 
-def _blockscout_fetch_address(base_url: str, address: str) -> Dict[str, Any]:
-    """GET /api/v2/addresses/{addr} — native balance + coin exchange rate."""
+async def _blockscout_fetch_address(
+    client: httpx.AsyncClient, base_url: str, address: str
+) -> Optional[Dict[str, Any]]:
+    """GET /api/v2/addresses/{addr} — native balance + coin exchange rate.
+
+    Returns None when the request fails.
+    """
     try:
-        resp = requests.get(
-            f"{base_url}/api/v2/addresses/{address}",
-            timeout=_HTTP_TIMEOUT,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        resp = await _get(client, f"{base_url}/api/v2/addresses/{address}")
+        return _json_loads(resp.content)
     except Exception as exc:
         logger.warning("Blockscout address fetch failed (%s): %s", base_url, exc)
-        return {}
+        return None
 
 
-def _blockscout_fetch_tokens(base_url: str, address: str) -> List[Dict[str, Any]]:
-    """GET /api/v2/addresses/{addr}/token-balances — ERC-20 holdings with price."""
+async def _blockscout_fetch_tokens(
+    client: httpx.AsyncClient, base_url: str, address: str
+) -> Optional[List[Dict[str, Any]]]:
+    """GET /api/v2/addresses/{addr}/token-balances — ERC-20 holdings with price.
+
+    Returns None when the request fails.
+    """
     try:
-        resp = requests.get(
-            f"{base_url}/api/v2/addresses/{address}/token-balances",
-            timeout=_HTTP_TIMEOUT,
-        )
-        resp.raise_for_status()
-        return resp.json()  # list of token objects
+        return await _get_items(client, f"{base_url}/api/v2/addresses/{address}/token-balances")
     except Exception as exc:
         logger.warning("Blockscout token-balances fetch failed (%s): %s", base_url, exc)
-        return []
+        return None
 
 
-def _process_blockscout_chain(
+async def _process_blockscout_chain(
+    client: httpx.AsyncClient,
     chain_name: str,
     base_url: str,
     address: str,
-) -> List[Dict[str, Any]]:
-    """Fetch and normalise all holdings on a single Blockscout-indexed chain."""
+) -> tuple[List[Dict[str, Any]], bool]:
+    """Fetch and normalise all holdings on a single Blockscout-indexed chain.
+
+    Returns the assets and whether both requests succeeded.
+    """
     assets: List[Dict[str, Any]] = []
+    addr_data, tokens = await asyncio.gather(
+        _blockscout_fetch_address(client, base_url, address),
+        _blockscout_fetch_tokens(client, base_url, address),
+    )
+    complete = addr_data is not None and tokens is not None
 
     # ── Native token ──
-    addr_data = _blockscout_fetch_address(base_url, address)
     if addr_data:
         try:
             raw_balance = int(addr_data.get("coin_balance") or "0")
-            balance = raw_balance / (10 ** NATIVE_DECIMALS)
+            balance = raw_balance / _POW10[NATIVE_DECIMALS]
             exchange_rate = float(addr_data.get("exchange_rate") or 0)
             value_usd = balance * exchange_rate
             symbol = NATIVE_SYMBOL.get(chain_name, "ETH")
             if value_usd >= MIN_VALUE_USD or balance >= 0.000001:
-                assets.append({
-                    "symbol": symbol,
-                    "name": symbol,
-                    "balance": round(balance, 6),
-                    "value_usd": round(value_usd, 2),
-                    "chain": chain_name,
-                    "contract_address": "native",
-                    "category": _classify(symbol),
-                })
+                assets.append(_make_asset(symbol, symbol, balance, value_usd, chain_name, "native"))
         except (ValueError, TypeError):
             pass
 
     # ── ERC-20 tokens ──
-    tokens = _blockscout_fetch_tokens(base_url, address)
-    for tok in tokens:
+    for tok in tokens or ():
         try:
             token_info = tok.get("token", {})
             decimals = int(token_info.get("decimals") or 18)
             raw_value = int(tok.get("value") or "0")
-            balance = raw_value / (10 ** decimals)
+            balance = raw_value / (_POW10[decimals] if 0 <= decimals < _POW10_SIZE else 10 ** decimals)
             if balance <= 0:
                 continue
 
@@ -184,19 +309,14 @@ def _process_blockscout_chain(
             if value_usd < MIN_VALUE_USD and balance < 0.000001:
                 continue
 
-            assets.append({
-                "symbol": symbol,
-                "name": token_info.get("name", symbol),
-                "balance": round(balance, 6),
-                "value_usd": round(value_usd, 2),
-                "chain": chain_name,
-                "contract_address": token_info.get("address_hash", ""),
-                "category": _classify(symbol),
-            })
+            assets.append(_make_asset(
+                symbol, token_info.get("name", symbol), balance, value_usd,
+                chain_name, token_info.get("address_hash", ""),
+            ))
         except (ValueError, TypeError):
             continue
 
-    return assets
+    return assets, complete
 
 
 # ---------------------------------------------------------------------------
@@ -205,75 +325,78 @@ def _process_blockscout_chain(
 
 _ROUTESCAN_BASE = "https://api.routescan.io/v2/network/mainnet/evm"
 
+_ALL_CHAINS = tuple(BLOCKSCOUT_CHAINS) + tuple(ROUTESCAN_CHAINS)
+
+
+async def _routescan_fetch_tokens(
+    client: httpx.AsyncClient, chain_id: int, address: str
+) -> Optional[List[Dict[str, Any]]]:
+    """GET /v2/network/mainnet/evm/{chainId}/address/{addr}/erc20-holdings.
 
-def _routescan_fetch_tokens(chain_id: int, address: str) -> List[Dict[str, Any]]:
-    """GET /v2/network/mainnet/evm/{chainId}/address/{addr}/erc20-holdings."""
+    Returns None when the request fails.
+    """
     try:
-        resp = requests.get(
-            f"{_ROUTESCAN_BASE}/{chain_id}/address/{address}/erc20-holdings",
-            timeout=_HTTP_TIMEOUT,
+        return await _get_items(
+            client, f"{_ROUTESCAN_BASE}/{chain_id}/address/{address}/erc20-holdings", "items"
         )
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("items", [])
     except Exception as exc:
         logger.warning("Routescan fetch failed (chain %s): %s", chain_id, exc)
-        return []
+        return None
+
 
+async def _routescan_fetch_native(
+    client: httpx.AsyncClient, chain_id: int, address: str
+) -> Optional[Dict[str, Any]]:
+    """GET /v2/network/mainnet/evm/{chainId}/address/{addr}.
 
-def _routescan_fetch_native(chain_id: int, address: str) -> Dict[str, Any]:
-    """GET /v2/network/mainnet/evm/{chainId}/address/{addr}."""
+    Returns None when the request fails.
+    """
     try:
-        resp = requests.get(
-            f"{_ROUTESCAN_BASE}/{chain_id}/address/{address}",
-            timeout=_HTTP_TIMEOUT,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        resp = await _get(client, f"{_ROUTESCAN_BASE}/{chain_id}/address/{address}")
+        return _json_loads(resp.content)
     except Exception as exc:
         logger.warning("Routescan native fetch failed (chain %s): %s", chain_id, exc)
-        return {}
+        return None
 
 
-def _process_routescan_chain(
+async def _process_routescan_chain(
+    client: httpx.AsyncClient,
     chain_name: str,
     chain_id: int,
     address: str,
-) -> List[Dict[str, Any]]:
-    """Fetch and normalise all holdings on a single Routescan-indexed chain."""
+) -> tuple[List[Dict[str, Any]], bool]:
+    """Fetch and normalise all holdings on a single Routescan-indexed chain.
+
+    Returns the assets and whether both requests succeeded.
+    """
     assets: List[Dict[str, Any]] = []
+    native_data, tokens = await asyncio.gather(
+        _routescan_fetch_native(client, chain_id, address),
+        _routescan_fetch_tokens(client, chain_id, address),
+    )
+    complete = native_data is not None and tokens is not None
 
     # ── Native token ──
-    native_data = _routescan_fetch_native(chain_id, address)
     if native_data:
         try:
             raw_balance = int(native_data.get("balance") or "0")
-            balance = raw_balance / (10 ** NATIVE_DECIMALS)
+            balance = raw_balance / _POW10[NATIVE_DECIMALS]
             # Routescan native endpoint may not include price;
             # use CoinGecko-style fallback only for AVAX
             native_price = float(native_data.get("tokenPriceUsd") or 0)
             value_usd = balance * native_price
             symbol = NATIVE_SYMBOL.get(chain_name, "AVAX")
             if value_usd >= MIN_VALUE_USD or balance >= 0.000001:
-                assets.append({
-                    "symbol": symbol,
-                    "name": symbol,
-                    "balance": round(balance, 6),
-                    "value_usd": round(value_usd, 2),
-                    "chain": chain_name,
-                    "contract_address": "native",
-                    "category": _classify(symbol),
-                })
+                assets.append(_make_asset(symbol, symbol, balance, value_usd, chain_name, "native"))
         except (ValueError, TypeError):
             pass
 
     # ── ERC-20 tokens ──
-    tokens = _routescan_fetch_tokens(chain_id, address)
-    for tok in tokens:
+    for tok in tokens or ():
         try:
             decimals = int(tok.get("tokenDecimals") or 18)
             raw_qty = int(tok.get("tokenQuantity") or "0")
-            balance = raw_qty / (10 ** decimals)
+            balance = raw_qty / (_POW10[decimals] if 0 <= decimals < _POW10_SIZE else 10 ** decimals)
             if balance <= 0:
                 continue
 
@@ -283,32 +406,80 @@ def _process_routescan_chain(
             if value_usd < MIN_VALUE_USD and balance < 0.000001:
                 continue
 
-            assets.append({
-                "symbol": symbol,
-                "name": tok.get("tokenName", symbol),
-                "balance": round(balance, 6),
-                "value_usd": round(value_usd, 2),
-                "chain": chain_name,
-                "contract_address": tok.get("tokenAddress", ""),
-                "category": _classify(symbol),
-            })
+            assets.append(_make_asset(
+                symbol, tok.get("tokenName", symbol), balance, value_usd,
+                chain_name, tok.get("tokenAddress", ""),
+            ))
         except (ValueError, TypeError):
             continue
 
-    return assets
+    return assets, complete
+
+
+async def _fetch_chains(
+    address: str, chains: List[str]
+) -> Dict[str, tuple[List[Dict[str, Any]], bool]]:
+    """Fetch the given chains concurrently over the shared HTTP client.
+
+    Maps each chain to its assets and whether every request for it
+    succeeded.  Chains whose fetch raised are logged and left out.
+    """
+    client = _http_client()
+    tasks = []
+    for chain_name in chains:
+        if chain_name in BLOCKSCOUT_CHAINS:
+            tasks.append(_process_blockscout_chain(
+                client, chain_name, BLOCKSCOUT_CHAINS[chain_name], address
+            ))
+        else:
+            tasks.append(_process_routescan_chain(
+                client, chain_name, ROUTESCAN_CHAINS[chain_name], address
+            ))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    fetched: Dict[str, tuple[List[Dict[str, Any]], bool]] = {}
+    for chain, result in zip(chains, results):
+        if isinstance(result, BaseException):
+            logger.warning("Failed to fetch %s: %s", chain, result)
+            continue
+        fetched[chain] = result
+    return fetched
 
 
 # ---------------------------------------------------------------------------
 # Classification
 # ---------------------------------------------------------------------------
 
-def _classify(symbol: str) -> str:
-    upper = symbol.upper()
-    if upper in STABLECOIN_SYMBOLS:
-        return "stablecoin"
-    if upper in BLUE_CHIP_SYMBOLS:
-        return "blue_chip"
-    return "altcoin"
+# Upper-cased symbol → category; every caller already upper-cases the symbol.
+_CATEGORY: Dict[str, str] = {
+    **{sym.upper(): "blue_chip" for sym in BLUE_CHIP_SYMBOLS},
+    **{sym.upper(): "stablecoin" for sym in STABLECOIN_SYMBOLS},
+}
+
+
+def _make_asset(
+    symbol: str, name: str, balance: float, value_usd: float, chain: str, address: str
+) -> Dict[str, Any]:
+    """Build a normalised asset dict.
+
+    Asset dicts go to the LLM verbatim, so they use the short keys listed in
+    get_user_portfolio_tool's docstring to save prompt tokens.
+
+    Stablecoin and blue-chip symbols are unambiguous, so only altcoins carry
+    their contract address.
+    """
+    category = _CATEGORY.get(symbol, "altcoin")
+    asset: Dict[str, Any] = {
+        "s": symbol,
+        "n": name,
+        "b": round(balance, 6),
+        "v": round(value_usd, 2),
+        "ch": chain,
+        "c": category,
+    }
+    if category == "altcoin":
+        asset["addr"] = address
+    return asset
 
 
 # ---------------------------------------------------------------------------
@@ -324,82 +495,102 @@ class _GetPortfolioArgs(BaseModel):
 def get_user_portfolio_tool() -> str:
     """Fetch the connected user's multi-chain token holdings with USD values.
 
-    Returns a JSON object with total_value_usd, top_holdings, allocation
-    breakdown (stablecoins %, blue_chips %, altcoins %), and the full
-    asset list.  Use this data to analyze portfolio risk and concentration.
+    Returns a JSON object with total_value_usd, allocation breakdown
+    (stablecoins %, blue_chips %, altcoins %), and the full asset list
+    sorted by USD value, largest first (its first entries are the top
+    holdings).  Use this data to analyze portfolio risk and concentration.
+
+    Asset keys are abbreviated: s=symbol, n=name, b=balance, v=value_usd,
+    ch=chain, addr=contract_address (altcoins only), c=category,
+    p=percentage of total.
     """
     _, _, wallet_address = _CURRENT_SESSION.get()
 
     if not wallet_address:
-        return json.dumps({"error": "No wallet address available. Ask the user to connect their wallet."})
-
-    # Check cache
-    cache_key = f"portfolio:{wallet_address.lower()}"
-    cached = _get_cached(cache_key)
-    if cached:
-        return cached
-
-    # ── Fetch all chains in parallel ──
-    all_assets: List[Dict[str, Any]] = []
-
-    with ThreadPoolExecutor(max_workers=6) as pool:
-        futures = {}
-
-        # Blockscout chains
-        for chain_name, base_url in BLOCKSCOUT_CHAINS.items():
-            fut = pool.submit(_process_blockscout_chain, chain_name, base_url, wallet_address)
-            futures[fut] = chain_name
-
-        # Routescan chains
-        for chain_name, chain_id in ROUTESCAN_CHAINS.items():
-            fut = pool.submit(_process_routescan_chain, chain_name, chain_id, wallet_address)
-            futures[fut] = chain_name
-
-        for fut in as_completed(futures):
-            chain = futures[fut]
-            try:
-                all_assets.extend(fut.result())
-            except Exception as exc:
-                logger.warning("Failed to fetch %s: %s", chain, exc)
+        return _json_dumps({"error": "No wallet address available. Ask the user to connect their wallet."})
+    if not _WALLET_RE.match(wallet_address):
+        # Every explorer would reject it; skip the round of requests.
+        return _json_dumps({"error": "The connected wallet address is not a valid EVM address (0x followed by 40 hex characters)."})
+
+    # ── Per-chain cache; fetch only the chains that missed, in parallel ──
+    wallet_key = wallet_address.lower()
+    by_chain: Dict[str, List[Dict[str, Any]]] = {}
+    missing: List[str] = []
+    for chain_name in _ALL_CHAINS:
+        cached = _get_cached(f"{chain_name}:{wallet_key}")
+        if cached is None:
+            missing.append(chain_name)
+        else:
+            by_chain[chain_name] = cached
+
+    if missing:
+        fetched = asyncio.run_coroutine_threadsafe(
+            _fetch_chains(wallet_address, missing), _http_loop()
+        ).result()
+        for chain_name, (assets, complete) in fetched.items():
+            # A chain with a failed explorer request is shown but not cached,
+            # so the next call retries it instead of serving partial holdings.
+            if complete:
+                _set_cached(f"{chain_name}:{wallet_key}", assets)
+            by_chain[chain_name] = assets
+
+    # Aggregation annotates the asset dicts, so work on copies of cached entries.
+    all_assets = [
+        dict(asset)
+        for chain_name in _ALL_CHAINS
+        for asset in by_chain.get(chain_name, ())
+    ]
 
     if not all_assets:
-        return json.dumps({
+        return _json_dumps({
             "wallet_address": wallet_address,
             "total_value_usd": 0,
             "asset_count": 0,
-            "chains_checked": list(BLOCKSCOUT_CHAINS.keys()) + list(ROUTESCAN_CHAINS.keys()),
-            "top_holdings": [],
+            "chains_checked": list(_ALL_CHAINS),
             "allocation": {"stablecoins_pct": 0, "blue_chips_pct": 0, "altcoins_pct": 0},
             "all_assets": [],
             "note": "No token balances found. The wallet may be empty or the APIs may be temporarily unavailable.",
         })
 
     # ── Aggregate ──
-    total_value = sum(a["value_usd"] for a in all_assets)
+    # One pass for the total and the per-category split.
+    total_value = stablecoins_usd = blue_chips_usd = altcoins_usd = 0.0
     for a in all_assets:
-        a["percentage"] = round((a["value_usd"] / total_value * 100) if total_value > 0 else 0, 2)
-
-    all_assets.sort(key=lambda a: a["value_usd"], reverse=True)
-
-    stablecoins_usd = sum(a["value_usd"] for a in all_assets if a["category"] == "stablecoin")
-    blue_chips_usd = sum(a["value_usd"] for a in all_assets if a["category"] == "blue_chip")
-    altcoins_usd = sum(a["value_usd"] for a in all_assets if a["category"] == "altcoin")
-
-    result = json.dumps({
+        value = a["v"]
+        total_value += value
+        category = a["c"]
+        if category == "stablecoin":
+            stablecoins_usd += value
+        elif category == "blue_chip":
+            blue_chips_usd += value
+        else:
+            altcoins_usd += value
+
+    if total_value > 0:
+        for a in all_assets:
+            a["p"] = round(a["v"] / total_value * 100, 2)
+        allocation = {
+            "stablecoins_pct": round(stablecoins_usd / total_value * 100, 1),
+            "blue_chips_pct": round(blue_chips_usd / total_value * 100, 1),
+            "altcoins_pct": round(altcoins_usd / total_value * 100, 1),
+        }
+    else:
+        # Dust-only wallet: every share is zero.
+        for a in all_assets:
+            a["p"] = 0
+        allocation = {"stablecoins_pct": 0, "blue_chips_pct": 0, "altcoins_pct": 0}
+
+    all_assets.sort(key=lambda a: a["v"], reverse=True)
+
+    result = _json_dumps({
         "wallet_address": wallet_address,
         "total_value_usd": round(total_value, 2),
         "asset_count": len(all_assets),
-        "chains_checked": list(BLOCKSCOUT_CHAINS.keys()) + list(ROUTESCAN_CHAINS.keys()),
-        "top_holdings": all_assets[:5],
-        "allocation": {
-            "stablecoins_pct": round((stablecoins_usd / total_value * 100) if total_value > 0 else 0, 1),
-            "blue_chips_pct": round((blue_chips_usd / total_value * 100) if total_value > 0 else 0, 1),
-            "altcoins_pct": round((altcoins_usd / total_value * 100) if total_value > 0 else 0, 1),
-        },
+        "chains_checked": list(_ALL_CHAINS),
+        "allocation": allocation,
         "all_assets": all_assets,
     })
 
-    _set_cached(cache_key, result)
     return result
 
 
@@ -64,8 +64,22 @@ class PreExtractedParams:
 # Compiled patterns (module-level for zero per-call overhead)
 # ---------------------------------------------------------------------------
 
+# The swap patterns both open with one of these verbs, so no match can start
+# before the first verb in the text.
+_SWAP_VERBS = r"swap|exchange|convert|trade|troque|trocar"
+_SWAP_TRIGGER = re.compile(_SWAP_VERBS, re.IGNORECASE)
+
+# Literal prefilters: a match of the intent pattern implies one of these
+# substrings in the casefolded text, and plain substring tests are far
+# cheaper than a case-insensitive regex scan.  No key contains an "i":
+# IGNORECASE lets a dotted or dotless I stand in for it, which casefold()
+# does not map back, so withdraw and deposit are keyed on "thdraw"/"depos".
+_SWAP_KEYS = ("swap", "exchange", "convert", "trade", "troque", "trocar")
+_LENDING_KEYS = ("supply", "borrow", "repay", "thdraw", "depos", "lend")
+_STAKING_KEYS = ("stake",)  # also covers "unstake"
+
 _SWAP_PATTERN = re.compile(
-    r"(?:swap|exchange|convert|trade|troque|trocar)\s+"
+    rf"(?:{_SWAP_VERBS})\s+"
     r"(?:(\d+(?:[.,]\d+)?)\s+)?"       # optional amount
     r"(\w+)\s+"                          # from_token
     r"(?:for|to|into|por|para)\s+"
@@ -77,7 +91,7 @@ _SWAP_PATTERN = re.compile(
 # Cross-chain pattern: "swap X from Ethereum to Y on Arbitrum"
 # or "swap X on Ethereum for Y on Arbitrum"
 _CROSS_CHAIN_PATTERN = re.compile(
-    r"(?:swap|exchange|convert|trade|troque|trocar)\s+"
+    rf"(?:{_SWAP_VERBS})\s+"
     r"(?:(\d+(?:[.,]\d+)?)\s+)?"                       # optional amount
     r"(\w+)\s+"                                          # from_token
     r"(?:from|on|na|no|em)\s+(\S+)\s+"                  # from_network
@@ -114,6 +128,19 @@ _NETWORK_MENTION = re.compile(
     re.IGNORECASE,
 )
 
+# DCA target token (e.g. "into ETH", "para USDC")
+_DCA_TO_TOKEN = re.compile(
+    r"(?:to|into|para)\s+([A-Za-z]{2,10})\b",
+    re.IGNORECASE,
+)
+
+
+def _mentions(folded: str, keys: tuple[str, ...]) -> bool:
+    for key in keys:
+        if key in folded:
+            return True
+    return False
+
 
 def _safe_decimal(raw: str | None) -> Optional[Decimal]:
     if not raw:
@@ -137,17 +164,20 @@ def pre_extract(text: str, intent: str) -> PreExtractedParams:
     params = PreExtractedParams()
 
     if intent == "swap":
+        # Locate the first swap verb once; both swap patterns resume from it
+        # and are skipped entirely when the text has none.
+        trigger = _SWAP_TRIGGER.search(text) if _mentions(text.casefold(), _SWAP_KEYS) else None
         # Try cross-chain pattern first: "swap X from Ethereum to Y on Arbitrum"
-        xm = _CROSS_CHAIN_PATTERN.search(text)
+        xm = _CROSS_CHAIN_PATTERN.search(text, trigger.start()) if trigger else None
         if xm:
             params.amount = _safe_decimal(xm.group(1))
             params.from_token = xm.group(2).upper()
             params.from_network = xm.group(3).lower()
             params.to_token = xm.group(4).upper()
             params.to_network = (xm.group(5) or xm.group(3)).lower()
-        else:
+        elif trigger:
             # Standard pattern: "swap X ETH to USDC on Base"
-            m = _SWAP_PATTERN.search(text)
+            m = _SWAP_PATTERN.search(text, trigger.start())
             if m:
                 params.amount = _safe_decimal(m.group(1))
                 params.from_token = m.group(2).upper()
@@ -171,7 +201,7 @@ def pre_extract(text: str, intent: str) -> PreExtractedParams:
                 params.to_network = network
 
     elif intent == "lending":
-        m = _LENDING_PATTERN.search(text)
+        m = _LENDING_PATTERN.search(text) if _mentions(text.casefold(), _LENDING_KEYS) else None
         if m:
             params.action = m.group(1).lower()
             if params.action == "deposit":
@@ -182,7 +212,7 @@ def pre_extract(text: str, intent: str) -> PreExtractedParams:
                 params.from_network = m.group(4).lower()
 
     elif intent == "staking":
-        m = _STAKING_PATTERN.search(text)
+        m = _STAKING_PATTERN.search(text) if _mentions(text.casefold(), _STAKING_KEYS) else None
         if m:
             params.action = m.group(1).lower()
             params.amount = _safe_decimal(m.group(2))
@@ -196,7 +226,7 @@ def pre_extract(text: str, intent: str) -> PreExtractedParams:
             params.amount = _safe_decimal(am.group(1))
             params.from_token = am.group(2).upper()
         # Look for "to TOKEN"
-        to_m = re.search(r"(?:to|into|para)\s+([A-Za-z]{2,10})\b", text, re.IGNORECASE)
+        to_m = _DCA_TO_TOKEN.search(text)
         if to_m:
             params.to_token = to_m.group(1).upper()
 
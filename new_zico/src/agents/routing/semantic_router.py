@@ -7,8 +7,11 @@ exemplar embeddings.  Latency target: < 100 ms per classification.
 
 from __future__ import annotations
 
+import inspect
 import logging
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Sequence
 
@@ -175,6 +178,75 @@ INTENT_EXEMPLARS: Dict[IntentCategory, List[str]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Query batching
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _QueryBatch:
+    texts: List[str] = field(default_factory=list)
+    vectors: Optional[np.ndarray] = None
+    error: Optional[BaseException] = None
+    full: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class _QueryBatcher:
+    """Coalesce concurrent ``embed_query`` calls into one batched request.
+
+    The first caller of a window becomes its leader: it waits up to *window*
+    seconds for other callers to join, embeds every queued text in a single
+    ``embed_documents`` call and hands each caller its own row.  Texts are
+    embedded with the query task type, so vectors match ``embed_query``.
+    """
+
+    def __init__(self, embeddings_model, window: float = 0.01, max_batch: int = 32) -> None:
+        self._embeddings = embeddings_model
+        self._window = window
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open: Optional[_QueryBatch] = None
+
+    def embed_query(self, text: str) -> np.ndarray:
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _QueryBatch()
+            index = len(batch.texts)
+            batch.texts.append(text)
+            if len(batch.texts) >= self._max_batch:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self._window)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            try:
+                vectors = self._embeddings.embed_documents(batch.texts, task_type="RETRIEVAL_QUERY")
+                batch.vectors = np.asarray(vectors, dtype=np.float32)
+            except Exception as exc:
+                batch.error = exc
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.vectors[index]
+
+
+def _accepts_task_type(embeddings_model) -> bool:
+    """True when ``embed_documents`` can embed texts as queries (Gemini)."""
+    try:
+        return "task_type" in inspect.signature(embeddings_model.embed_documents).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
 # ---------------------------------------------------------------------------
 # Router implementation
 # ---------------------------------------------------------------------------
@@ -186,9 +258,24 @@ class SemanticRouter:
     HIGH_CONFIDENCE = 0.78   # Route directly, no LLM confirmation needed
     LOW_CONFIDENCE = 0.50    # Below this → fall through to supervisor graph
 
+    # Normalised messages whose scores are kept for repeat phrasings
+    CACHE_SIZE = 2048
+
     def __init__(self, embeddings_model) -> None:
         self._embeddings = embeddings_model
-        self._exemplar_vectors: Dict[IntentCategory, np.ndarray] = {}
+        # Concurrent requests share one embedding round-trip where the model
+        # can batch queries; otherwise each call embeds on its own.
+        self._query_batcher = (
+            _QueryBatcher(embeddings_model) if _accepts_task_type(embeddings_model) else None
+        )
+        # All exemplars stacked into one row-normalised float32 matrix; each
+        # intent owns a contiguous block of rows starting at its offset.
+        self._exemplar_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._intent_order: List[IntentCategory] = []
+        self._intent_offsets: np.ndarray = np.empty(0, dtype=np.intp)
+        # LRU of normalised message -> (best intent, score)
+        self._cache: OrderedDict[str, tuple[IntentCategory, float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._ready = False
 
     # ---- Lifecycle ---------------------------------------------------------
@@ -198,14 +285,31 @@ class SemanticRouter:
         if self._ready:
             return
         try:
+            blocks: List[np.ndarray] = []
+            intent_order: List[IntentCategory] = []
+            offsets: List[int] = []
+            total = 0
             for intent, examples in INTENT_EXEMPLARS.items():
+                if not examples:
+                    continue
                 vectors = self._embeddings.embed_documents(examples)
-                self._exemplar_vectors[intent] = np.array(vectors)
+                blocks.append(np.asarray(vectors, dtype=np.float32))
+                intent_order.append(intent)
+                offsets.append(total)
+                total += len(examples)
+            # Exemplars never change after warm-up, so normalise them once here.
+            matrix = np.vstack(blocks)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-10
+            self._exemplar_matrix = matrix
+            self._intent_order = intent_order
+            self._intent_offsets = np.asarray(offsets, dtype=np.intp)
+            with self._cache_lock:
+                self._cache.clear()
             self._ready = True
             logger.info(
                 "SemanticRouter warmed up: %d intents, %d total exemplars",
-                len(self._exemplar_vectors),
-                sum(len(v) for v in INTENT_EXEMPLARS.values()),
+                len(intent_order),
+                total,
             )
         except Exception:
             logger.exception("SemanticRouter warm-up failed; falling back to GENERAL.")
@@ -237,23 +341,22 @@ class SemanticRouter:
 
         threshold = high_threshold or self.HIGH_CONFIDENCE
 
+        # Repeat phrasings differing only in case or spacing reuse the score
+        # and skip the embedding round-trip.
+        key = " ".join(user_message.lower().split())
+        with self._cache_lock:
+            scored = self._cache.get(key)
+            if scored is not None:
+                self._cache.move_to_end(key)
+
         try:
-            query_vec = np.array(self._embeddings.embed_query(user_message))
-            # Normalise for cosine similarity
-            query_norm = query_vec / (np.linalg.norm(query_vec) + 1e-10)
-
-            best_intent = IntentCategory.GENERAL
-            best_score = 0.0
-
-            for intent, exemplar_matrix in self._exemplar_vectors.items():
-                # Normalise rows
-                norms = np.linalg.norm(exemplar_matrix, axis=1, keepdims=True) + 1e-10
-                normed = exemplar_matrix / norms
-                similarities = normed @ query_norm
-                max_sim = float(np.max(similarities))
-                if max_sim > best_score:
-                    best_score = max_sim
-                    best_intent = intent
+            if scored is None:
+                scored = self._score(user_message)
+                with self._cache_lock:
+                    self._cache[key] = scored
+                    if len(self._cache) > self.CACHE_SIZE:
+                        self._cache.popitem(last=False)
+            best_intent, best_score = scored
 
             agent_name = _INTENT_AGENT_MAP.get(best_intent, "default_agent")
 
@@ -271,3 +374,22 @@ class SemanticRouter:
                 agent_name="default_agent",
                 needs_llm_confirmation=True,
             )
+
+    def _score(self, user_message: str) -> tuple[IntentCategory, float]:
+        """Return the best-matching intent and its cosine similarity."""
+        if self._query_batcher is not None:
+            query_vec = self._query_batcher.embed_query(user_message)
+        else:
+            query_vec = np.asarray(self._embeddings.embed_query(user_message), dtype=np.float32)
+        # Normalise for cosine similarity
+        query_norm = query_vec / (np.linalg.norm(query_vec) + 1e-10)
+
+        # One matrix-vector product over every exemplar, then the best
+        # score within each intent's block of rows.
+        similarities = self._exemplar_matrix @ query_norm
+        per_intent = np.maximum.reduceat(similarities, self._intent_offsets)
+        best = int(np.argmax(per_intent))
+
+        if per_intent[best] > 0.0:
+            return self._intent_order[best], float(per_intent[best])
+        return IntentCategory.GENERAL, 0.0
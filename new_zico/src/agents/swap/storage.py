@@ -12,6 +12,7 @@ from src.integrations.panorama_gateway import (
     PanoramaGatewayClient,
     PanoramaGatewayError,
     PanoramaGatewaySettings,
+    get_panorama_client,
     get_panorama_settings,
 )
 
@@ -20,7 +21,7 @@ SWAP_HISTORY_ENTITY = "swap-histories"
 
 
 def _utc_now_iso() -> str:
-    return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat()
 
 
 def _identifier(user_id: str, conversation_id: str) -> str:
@@ -53,7 +54,9 @@ class SwapStateRepository:
         self._history_limit = history_limit
         try:
             self._settings = settings or get_panorama_settings()
-            self._client = client or PanoramaGatewayClient(self._settings)
+            self._client = client or (
+                PanoramaGatewayClient(self._settings) if settings else get_panorama_client()
+            )
             self._use_gateway = True
         except ValueError:
             # PANORAMA_GATEWAY_URL or JWT secrets not configured – fall back to local store.
@@ -290,11 +290,11 @@ def _clear_ready_metadata(agent_name, response_meta, user_id, conversation_id):
     event = response_meta.get("event")
 
     if agent_name == "token swap" and (status == "ready" or event == "swap_intent_ready"):
-        metadata.set_swap_agent({}, user_id=user_id, conversation_id=conversation_id)
+        metadata.clear_swap_agent(user_id=user_id, conversation_id=conversation_id)
     elif agent_name == "lending" and (status == "ready" or event == "lending_intent_ready"):
-        metadata.set_lending_agent({}, user_id=user_id, conversation_id=conversation_id)
+        metadata.clear_lending_agent(user_id=user_id, conversation_id=conversation_id)
     elif agent_name == "staking" and (status == "ready" or event == "staking_intent_ready"):
-        metadata.set_staking_agent({}, user_id=user_id, conversation_id=conversation_id)
+        metadata.clear_staking_agent(user_id=user_id, conversation_id=conversation_id)
 
 
 @app.get("/health")
@@ -53,11 +53,20 @@ from src.agents.staking.prompt import STAKING_AGENT_SYSTEM_PROMPT
 from src.agents.search.agent import SearchAgent
 from src.agents.portfolio.agent import PortfolioAdvisorAgent
 from src.agents.portfolio.tools import portfolio_session
-from src.agents.portfolio.prompt import PORTFOLIO_ADVISOR_SYSTEM_PROMPT
 from src.agents.database.client import is_database_available
 
 logger = logging.getLogger(__name__)
 
+# Static tail of the entry system message per response mode, composed once;
+# only the date line is built per request.
+_ENTRY_INSTRUCTIONS: Dict[str, str] = {
+    mode: (
+        "Always respond in English, regardless of the user's language."
+        f"\n\n{get_generic_directive(mode)}"
+    )
+    for mode in ("fast", "reasoning")
+}
+
 
 # ---------------------------------------------------------------------------
 # Module-level singletons (initialised once at startup)
@@ -183,13 +192,8 @@ def entry_node(state: AgentState) -> dict:
 
     today = date.today().strftime("%B %d, %Y")
     response_mode = state.get("response_mode", "fast")
-    mode_directive = get_generic_directive(response_mode)
-    base_instructions = (
-        f"Today's date is {today}.\n"
-        "Always respond in English, regardless of the user's language."
-    )
-    if mode_directive:
-        base_instructions += f"\n\n{mode_directive}"
+    mode_instructions = _ENTRY_INSTRUCTIONS.get(response_mode) or _ENTRY_INSTRUCTIONS["fast"]
+    base_instructions = f"Today's date is {today}.\n{mode_instructions}"
     langchain_messages.insert(
         0,
         SystemMessage(content=base_instructions),
@@ -623,8 +627,9 @@ def portfolio_advisor_node(state: AgentState, config: RunnableConfig | None = No
             "nodes_executed": nodes,
         }
 
-    # Inject system prompt + per-agent mode directive
-    scoped_messages = [SystemMessage(content=PORTFOLIO_ADVISOR_SYSTEM_PROMPT)]
+    # Inject per-agent mode directive. The system prompt itself is supplied by
+    # the agent (as the cacheable prefix), so it is not repeated here.
+    scoped_messages: List[Any] = []
 
     agent_directive = get_agent_directive("portfolio_advisor", response_mode)
     if agent_directive:
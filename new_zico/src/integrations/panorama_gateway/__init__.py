@@ -1,11 +1,12 @@
 """Panorama data gateway client initialization helpers."""
 
-from .client import PanoramaGatewayClient, PanoramaGatewayError
+from .client import PanoramaGatewayClient, PanoramaGatewayError, get_panorama_client
 from .config import PanoramaGatewaySettings, get_panorama_settings
 
 __all__ = [
     "PanoramaGatewayClient",
     "PanoramaGatewayError",
     "PanoramaGatewaySettings",
+    "get_panorama_client",
     "get_panorama_settings",
 ]
@@ -5,6 +5,7 @@ import time
 import uuid
 from dataclasses import asdict
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Iterable, Optional
 
 import httpx
@@ -50,6 +51,7 @@ class PanoramaGatewayClient:
         self._client = client or httpx.Client(
             base_url=self._settings.base_url,
             timeout=self._settings.request_timeout,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
         )
 
     def __enter__(self) -> "PanoramaGatewayClient":
@@ -248,3 +250,10 @@ class PanoramaGatewayClient:
         """Return a serialisable snapshot of the current settings (useful for debugging)."""
 
         return asdict(self._settings)
+
+
+@lru_cache(maxsize=1)
+def get_panorama_client() -> PanoramaGatewayClient:
+    """Memoized client so every repository shares one keep-alive connection pool."""
+
+    return PanoramaGatewayClient(get_panorama_settings())
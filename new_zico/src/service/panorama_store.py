@@ -11,6 +11,7 @@ from src.integrations.panorama_gateway import (
     PanoramaGatewayClient,
     PanoramaGatewayError,
     PanoramaGatewaySettings,
+    get_panorama_client,
     get_panorama_settings,
 )
 
@@ -70,7 +71,9 @@ class PanoramaStore:
         settings: PanoramaGatewaySettings | None = None,
     ) -> None:
         self._settings = settings or get_panorama_settings()
-        self._client = client or PanoramaGatewayClient(self._settings)
+        self._client = client or (
+            PanoramaGatewayClient(self._settings) if settings else get_panorama_client()
+        )
         self._logger = logging.getLogger(__name__)
 
     # ---- user helpers -----------------------------------------------------